@@ -0,0 +1,83 @@
+import base64
+from datetime import timedelta
+from django.core.cache import cache
+from common.cache import bump_version, get_version
+from common.metrics import record_cache
+from rooms.models import Room
+from .models import Booking
+
+CALENDAR_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def month_starts(start, end):
+    """First day of every month touched by [start, end]."""
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def _month_key(room_pk, version, month):
+    return f"room-calendar:{room_pk}:{version}:{month:%Y-%m}"
+
+
+def invalidate_room_calendar(room_pk):
+    bump_version(f"room-calendar:{room_pk}")
+
+
+def encode_month(month, blocked_days):
+    """
+    Bit n (byte n // 8, bit n % 8) is set when the night of day n + 1 is
+    booked. Returns the bitset as base64.
+    """
+    bits = bytearray(4)
+    for day in blocked_days:
+        index = day.day - 1
+        bits[index // 8] |= 1 << (index % 8)
+    return base64.b64encode(bytes(bits)).decode()
+
+
+def build_months(room_pk, months):
+    """Compute bitsets for `months` from a single bookings range query."""
+    first = months[0]
+    last = (months[-1] + timedelta(days=32)).replace(day=1)
+    blocked = {month: set() for month in months}
+    stays = (
+        Booking.objects.for_room(room_pk)
+        .overlapping(first, last)
+        .values_list("check_in", "check_out")
+    )
+    for check_in, check_out in stays:
+        day = max(check_in, first)
+        while day < min(check_out, last):
+            month = day.replace(day=1)
+            if month in blocked:
+                blocked[month].add(day)
+            day += timedelta(days=1)
+    return {month: encode_month(month, days) for month, days in blocked.items()}
+
+
+def get_room_calendar(room_pk, start, end):
+    """
+    Availability bitsets for every month between start and end, keyed by
+    "YYYY-MM", or None when the room doesn't exist. Cached per room and
+    month; booking changes and deleting the room bump the room's calendar
+    version (see bookings/signals.py), so the room is only looked up when
+    a month has to be built.
+    """
+    version = get_version(f"room-calendar:{room_pk}")
+    months = list(month_starts(start, end))
+    keys = {month: _month_key(room_pk, version, month) for month in months}
+    cached = cache.get_many(keys.values())
+    missing = [month for month in months if keys[month] not in cached]
+    record_cache("room-calendar", hits=len(cached), misses=len(missing))
+    if missing:
+        if not Room.objects.filter(pk=room_pk).exists():
+            return None
+        fresh = build_months(room_pk, missing)
+        cache.set_many(
+            {keys[month]: bitset for month, bitset in fresh.items()},
+            CALENDAR_CACHE_TIMEOUT,
+        )
+        cached.update({keys[month]: bitset for month, bitset in fresh.items()})
+    return {f"{month:%Y-%m}": cached[keys[month]] for month in months}
@@ -0,0 +1,74 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from common.benchmark import percentile, rolled_back
+from users.models import User
+from rooms.models import Room
+from bookings.models import Booking
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure room availability check latency while a single room "
+        "accumulates years of bookings. Everything runs in a rolled back "
+        "transaction, so no data is left behind."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--years", type=int, default=10)
+        parser.add_argument("--checks", type=int, default=200)
+        parser.add_argument("--stay", type=int, default=3, help="Nights per stay")
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options["years"], options["checks"], options["stay"])
+
+    def run(self, years, checks, stay):
+        user = User.objects.create_user(email="benchmark-availability@example.com")
+        room = Room.objects.create(
+            name="Availability benchmark",
+            price=0,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=user,
+        )
+        today = timezone.localtime(timezone.now()).date()
+        # History grows backwards from today; the probe looks at next month.
+        probe_in = today + timedelta(days=30)
+        probe_out = probe_in + timedelta(days=stay)
+
+        self.stdout.write(f"{'years':>5} {'bookings':>9} {'p50 ms':>8} {'p95 ms':>8}")
+        start = today
+        for year in range(years + 1):
+            if year:
+                bookings = []
+                for _ in range(365 // stay):
+                    start -= timedelta(days=stay)
+                    bookings.append(
+                        Booking(
+                            kind=Booking.BookingKindChoices.ROOM,
+                            user=user,
+                            room=room,
+                            check_in=start,
+                            check_out=start + timedelta(days=stay),
+                            guests=1,
+                        )
+                    )
+                Booking.objects.bulk_create(bookings)
+                if connection.vendor == "postgresql":
+                    with connection.cursor() as cursor:
+                        cursor.execute("ANALYZE bookings_booking")
+            timings = []
+            for _ in range(checks):
+                started = time.perf_counter()
+                Booking.objects.is_room_available(room, probe_in, probe_out)
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{year:>5} {Booking.objects.for_room(room).count():>9} "
+                f"{percentile(timings, 50):>8.3f} {percentile(timings, 95):>8.3f}"
+            )
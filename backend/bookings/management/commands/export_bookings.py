@@ -0,0 +1,7 @@
+from common.transfer import ExportCommand
+from bookings.transfer import BookingTransfer
+
+
+class Command(ExportCommand):
+    help = "Stream every booking to a CSV or JSONL file, in import_bookings's format."
+    transfer_class = BookingTransfer
@@ -0,0 +1,7 @@
+from common.transfer import ImportCommand
+from bookings.transfer import BookingTransfer
+
+
+class Command(ImportCommand):
+    help = "Bulk load bookings from a CSV or JSONL file (see bookings/transfer.py)."
+    transfer_class = BookingTransfer
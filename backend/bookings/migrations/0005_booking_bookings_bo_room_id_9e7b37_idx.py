@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0004_initial"),
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+        ("rooms", "0003_room_rating_sum_room_review_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["room", "created_at", "id"],
+                name="bookings_bo_room_id_9e7b37_idx",
+            ),
+        ),
+    ]
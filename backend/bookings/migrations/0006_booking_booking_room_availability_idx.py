@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_booking_bookings_bo_room_id_9e7b37_idx"),
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+        ("rooms", "0004_room_rooms_room_created_2438c1_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                condition=models.Q(("kind", "room")),
+                fields=["room", "check_out"],
+                include=("check_in",),
+                name="booking_room_availability_idx",
+            ),
+        ),
+    ]
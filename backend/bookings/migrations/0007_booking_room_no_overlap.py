@@ -0,0 +1,96 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:01
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, F, OuterRef, Q
+
+
+def check_room_bookings(apps, schema_editor):
+    """
+    Stop with the offending bookings instead of a bare constraint error when
+    existing room bookings lack dates, end before they start or overlap.
+    Which stay to keep is for a person to decide, so nothing is changed.
+    """
+    Booking = apps.get_model("bookings", "Booking")
+    rooms = Booking.objects.filter(kind="room")
+    invalid = rooms.filter(
+        Q(check_in=None) | Q(check_out=None) | Q(check_in__gte=F("check_out"))
+    )
+    overlapping = rooms.exclude(pk__in=invalid).filter(
+        Exists(
+            rooms.exclude(pk=OuterRef("pk"))
+            .exclude(pk__in=invalid)
+            .filter(
+                room=OuterRef("room"),
+                check_in__lt=OuterRef("check_out"),
+                check_out__gt=OuterRef("check_in"),
+            )
+        )
+    )
+    problems = []
+    for label, queryset in (
+        ("missing or inverted dates", invalid),
+        ("overlapping stays", overlapping),
+    ):
+        pks = list(queryset.order_by("pk").values_list("pk", flat=True))
+        if pks:
+            problems.append(f"{label}: {', '.join(map(str, pks))}")
+    if problems:
+        raise RuntimeError(
+            "Fix or delete these room bookings before migrating ("
+            + "; ".join(problems)
+            + ")."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_booking_booking_room_availability_idx"),
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+        ("rooms", "0004_room_rooms_room_created_2438c1_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.RunPython(check_room_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="booking",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    models.Q(("kind", "room"), _negated=True),
+                    models.Q(
+                        ("check_in__isnull", False),
+                        ("check_in__lt", models.F("check_out")),
+                        ("check_out__isnull", False),
+                    ),
+                    _connector="OR",
+                ),
+                name="booking_room_dates",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="booking",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("kind", "room")),
+                expressions=[
+                    ("room", "="),
+                    (
+                        models.Func(
+                            "check_in",
+                            "check_out",
+                            models.Value("[)"),
+                            function="daterange",
+                            output_field=django.contrib.postgres.fields.ranges.DateRangeField(),
+                        ),
+                        "&&",
+                    ),
+                ],
+                name="booking_room_no_overlap",
+            ),
+        ),
+    ]
@@ -1,8 +1,26 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.core.exceptions import ValidationError
 from django.db import models
 from common.models import CommonModel
 from django.conf import settings
 
 
+class BookingQuerySet(models.QuerySet):
+    def for_room(self, room):
+        return self.filter(room=room, kind=Booking.BookingKindChoices.ROOM)
+
+    def overlapping(self, check_in, check_out):
+        """
+        Bookings whose stay shares at least one night with [check_in, check_out).
+        The check-out day itself is free, so back-to-back stays don't clash.
+        """
+        return self.filter(check_in__lt=check_out, check_out__gt=check_in)
+
+    def is_room_available(self, room, check_in, check_out):
+        return not self.for_room(room).overlapping(check_in, check_out).exists()
+
+
 class Booking(CommonModel):
     """Booking Model Definition"""
 
@@ -47,5 +65,74 @@ class Booking(CommonModel):
     )
     guests = models.PositiveIntegerField()
 
+    objects = BookingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["room", "created_at", "id"]),
+            # Availability lookups range-scan on check_out > requested check_in,
+            # so past stays are skipped no matter how much history a room has.
+            models.Index(
+                fields=["room", "check_out"],
+                include=["check_in"],
+                condition=models.Q(kind="room"),
+                name="booking_room_availability_idx",
+            ),
+        ]
+        constraints = [
+            # Checked before booking_room_no_overlap, whose daterange() fails
+            # with a bare DataError on inverted dates; see also clean().
+            models.CheckConstraint(
+                condition=~models.Q(kind="room")
+                | models.Q(
+                    check_in__isnull=False,
+                    check_out__isnull=False,
+                    check_in__lt=models.F("check_out"),
+                ),
+                name="booking_room_dates",
+            ),
+            # Last line of defence against double booking for writes that
+            # don't take the room lock (admin, scripts). Needs btree_gist.
+            ExclusionConstraint(
+                name="booking_room_no_overlap",
+                expressions=[
+                    ("room", RangeOperators.EQUAL),
+                    (
+                        models.Func(
+                            "check_in",
+                            "check_out",
+                            models.Value("[)"),
+                            function="daterange",
+                            output_field=DateRangeField(),
+                        ),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                condition=models.Q(kind="room"),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.kind.title()} booking for: {self.user}"
+
+    def clean(self):
+        # Field errors exclude the dates from validate_constraints(), which
+        # would otherwise run daterange() on them for booking_room_no_overlap.
+        if self.kind != self.BookingKindChoices.ROOM:
+            return
+        errors = {
+            field: "Room bookings need this date."
+            for field in ("check_in", "check_out")
+            if getattr(self, field) is None
+        }
+        if not errors and self.check_out <= self.check_in:
+            errors["check_out"] = "Check in should be smaller than check out."
+        if errors:
+            raise ValidationError(errors)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        booking = super().from_db(db, field_names, values)
+        # Lets the calendar signals invalidate the old room if it changes.
+        booking._loaded_room_id = booking.room_id
+        return booking
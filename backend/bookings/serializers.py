@@ -2,6 +2,8 @@ from django.utils import timezone
 from rest_framework import serializers
 from .models import Booking
 
+DATES_TAKEN = "Those (or some) of those dates are already taken."
+
 
 class CreateRoomBookingSerializer(serializers.ModelSerializer):
 
@@ -34,14 +36,13 @@ class CreateRoomBookingSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Check in should be smaller than check out."
             )
-        if Booking.objects.filter(
-            room=room,
-            check_in__lte=data["check_out"],
-            check_out__gte=data["check_in"],
-        ).exists():
-            raise serializers.ValidationError(
-                "Those (or some) of those dates are already taken."
-            )
+        if not Booking.objects.is_room_available(
+            room,
+            data["check_in"],
+            data["check_out"],
+        ):
+            # RoomBookings answers this code with 409, like a constraint hit.
+            raise serializers.ValidationError(DATES_TAKEN, code="dates_taken")
         return data
 
 
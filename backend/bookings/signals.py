@@ -0,0 +1,24 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rooms.models import Room
+from .models import Booking
+from .calendar import invalidate_room_calendar
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def invalidate_calendars(sender, instance, **kwargs):
+    room_pks = {instance.room_id, getattr(instance, "_loaded_room_id", None)}
+    for room_pk in room_pks - {None}:
+        # Wait for the commit, otherwise a concurrent read could cache the
+        # calendar again before the booking is visible.
+        transaction.on_commit(partial(invalidate_room_calendar, room_pk))
+    instance._loaded_room_id = instance.room_id
+
+
+@receiver(post_delete, sender=Room)
+def invalidate_deleted_room_calendar(sender, instance, **kwargs):
+    # Cached months would otherwise keep answering for the room.
+    transaction.on_commit(partial(invalidate_room_calendar, instance.pk))
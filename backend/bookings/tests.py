@@ -1,3 +1,290 @@
-from django.test import TestCase
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connection, transaction
+from django.test import TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+from users.models import User
+from rooms.models import Room
+from .models import Booking
+from .serializers import DATES_TAKEN
 
-# Create your tests here.
+
+class TestRoomAvailability(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="guest@test.com", password="x")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.day = timezone.localtime(timezone.now()).date() + timedelta(days=10)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=self.day,
+            check_out=self.day + timedelta(days=3),
+            guests=1,
+        )
+
+    def check(self, start, nights):
+        return self.client.get(
+            f"/api/v1/rooms/{self.room.pk}/bookings/check",
+            {
+                "check_in": self.day + timedelta(days=start),
+                "check_out": self.day + timedelta(days=start + nights),
+            },
+        )
+
+    def test_overlap(self):
+        self.assertFalse(self.check(-1, 2).data["ok"])
+        self.assertFalse(self.check(1, 1).data["ok"])
+        self.assertFalse(self.check(-2, 7).data["ok"])
+
+    def test_back_to_back_stays_are_available(self):
+        self.assertTrue(self.check(-2, 2).data["ok"])
+        self.assertTrue(self.check(3, 2).data["ok"])
+
+    def test_experience_bookings_are_ignored(self):
+        Booking.objects.filter(room=self.room).update(
+            kind=Booking.BookingKindChoices.EXPERIENCE
+        )
+        self.assertTrue(self.check(0, 3).data["ok"])
+
+    def test_invalid_dates(self):
+        self.assertEqual(self.check(2, -1).status_code, 400)
+        response = self.client.get(f"/api/v1/rooms/{self.room.pk}/bookings/check")
+        self.assertEqual(response.status_code, 400)
+
+    def book(self, start, nights):
+        self.client.force_authenticate(self.user)
+        return self.client.post(
+            f"/api/v1/rooms/{self.room.pk}/bookings",
+            {
+                "check_in": self.day + timedelta(days=start),
+                "check_out": self.day + timedelta(days=start + nights),
+                "guests": 1,
+            },
+            format="json",
+        )
+
+    def test_taken_dates_conflict(self):
+        response = self.book(1, 1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["non_field_errors"], [DATES_TAKEN])
+        self.assertEqual(self.book(1, -1).status_code, 400)
+
+    def test_constraint_conflict(self):
+        # A write that skipped the room lock lands between the check and
+        # the insert, and booking_room_no_overlap refuses ours.
+        def sneak_in(execute, sql, params, many, context):
+            if sql.startswith('INSERT INTO "bookings_booking"') and not sneaked:
+                sneaked.append(True)
+                Booking.objects.create(
+                    kind=Booking.BookingKindChoices.ROOM,
+                    user=self.user,
+                    room=self.room,
+                    check_in=self.day + timedelta(days=5),
+                    check_out=self.day + timedelta(days=6),
+                    guests=1,
+                )
+            return execute(sql, params, many, context)
+
+        sneaked = []
+        with connection.execute_wrapper(sneak_in):
+            response = self.book(5, 1)
+        self.assertEqual(sneaked, [True])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["non_field_errors"], [DATES_TAKEN])
+
+    def test_inverted_dates(self):
+        booking = Booking(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.user,
+            room=self.room,
+            check_in=self.day + timedelta(days=9),
+            check_out=self.day + timedelta(days=7),
+            guests=1,
+        )
+        # As the admin validates: a form error, not a DataError.
+        with self.assertRaises(ValidationError) as context:
+            booking.full_clean()
+        self.assertEqual(list(context.exception.message_dict), ["check_out"])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            booking.save()
+
+
+class TestRoomCalendar(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="guest@test.com")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}/calendar"
+        self.params = {"from": "2030-01-01", "to": "2030-02-28"}
+
+    def book(self, check_in, check_out):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=self.user,
+                room=self.room,
+                check_in=check_in,
+                check_out=check_out,
+                guests=1,
+            )
+
+    def blocked_days(self, bitset):
+        bits = base64.b64decode(bitset)
+        return [day + 1 for day in range(31) if bits[day // 8] & (1 << (day % 8))]
+
+    def test_bitmap(self):
+        self.book(date(2030, 1, 30), date(2030, 2, 2))
+        months = self.client.get(self.url, self.params).data["months"]
+        self.assertEqual(list(months), ["2030-01", "2030-02"])
+        self.assertEqual(self.blocked_days(months["2030-01"]), [30, 31])
+        self.assertEqual(self.blocked_days(months["2030-02"]), [1])
+
+    def test_cached_until_bookings_change(self):
+        self.client.get(self.url, self.params)
+        with self.assertNumQueries(0):
+            self.client.get(self.url, self.params)
+        booking = self.book(date(2030, 2, 10), date(2030, 2, 12))
+        months = self.client.get(self.url, self.params).data["months"]
+        self.assertEqual(self.blocked_days(months["2030-02"]), [10, 11])
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        months = self.client.get(self.url, self.params).data["months"]
+        self.assertEqual(self.blocked_days(months["2030-02"]), [])
+
+    def test_unknown_room(self):
+        self.client.get(self.url, self.params)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.delete()
+        self.assertEqual(self.client.get(self.url, self.params).status_code, 404)
+        response = self.client.get("/api/v1/rooms/0/calendar", self.params)
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_range(self):
+        response = self.client.get(self.url, {"from": "2030-02-01", "to": "2030-01-01"})
+        self.assertEqual(response.status_code, 400)
+        for params in ({"from": "tomorrow"}, {"to": "2030-13-01"}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400)
+
+
+@skipUnlessDBFeature("has_select_for_update")
+class TestConcurrentBooking(TransactionTestCase):
+
+    WORKERS = 12
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f"guest{i}@test.com")
+            for i in range(self.WORKERS)
+        ]
+        self.rooms = [
+            Room.objects.create(
+                name=f"Room {i}",
+                price=1,
+                rooms=1,
+                toilets=1,
+                description="",
+                address="",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.users[0],
+            )
+            for i in range(2)
+        ]
+        day = timezone.localtime(timezone.now()).date() + timedelta(days=10)
+        self.dates = {
+            "check_in": day,
+            "check_out": day + timedelta(days=2),
+            "guests": 1,
+        }
+
+    def book(self, user, room):
+        try:
+            client = APIClient()
+            client.force_authenticate(user)
+            return client.post(
+                f"/api/v1/rooms/{room.pk}/bookings",
+                self.dates,
+                format="json",
+            ).status_code
+        finally:
+            connection.close()
+
+    def test_exactly_one_booking_wins(self):
+        barrier = threading.Barrier(self.WORKERS)
+
+        def book(user):
+            barrier.wait()
+            return self.book(user, self.rooms[0])
+
+        with ThreadPoolExecutor(self.WORKERS) as executor:
+            statuses = list(executor.map(book, self.users))
+
+        self.assertEqual(statuses.count(200), 1)
+        self.assertEqual(statuses.count(409), self.WORKERS - 1)
+        self.assertEqual(Booking.objects.filter(room=self.rooms[0]).count(), 1)
+
+    def test_other_rooms_are_not_blocked(self):
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    Room.objects.select_for_update().get(pk=self.rooms[0].pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            locked.wait(10)
+            with ThreadPoolExecutor(1) as executor:
+                status = executor.submit(self.book, self.users[1], self.rooms[1])
+                self.assertEqual(status.result(timeout=5), 200)
+        finally:
+            release.set()
+            holder.join()
+
+    def test_exclusion_constraint_rejects_overlap(self):
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.users[0],
+            room=self.rooms[0],
+            check_in=self.dates["check_in"],
+            check_out=self.dates["check_out"],
+            guests=1,
+        )
+        with self.assertRaises(IntegrityError):
+            Booking.objects.create(
+                kind=Booking.BookingKindChoices.ROOM,
+                user=self.users[1],
+                room=self.rooms[0],
+                check_in=self.dates["check_in"] + timedelta(days=1),
+                check_out=self.dates["check_out"] + timedelta(days=1),
+                guests=1,
+            )
@@ -0,0 +1,33 @@
+from functools import partial
+from django.db import transaction
+from common.transfer import LookupMap, Transfer
+from users.models import User
+from rooms.models import Room
+from experiences.models import Experience
+from .calendar import invalidate_room_calendar
+from .models import Booking
+
+
+class BookingTransfer(Transfer):
+    """Users are matched by email, rooms and experiences by id."""
+
+    model = Booking
+    fields = (
+        "kind",
+        "check_in",
+        "check_out",
+        "experience_time",
+        "guests",
+    )
+    relations = {
+        "user": (partial(LookupMap, User.objects.all(), "email"), "user__email"),
+        "room": (partial(LookupMap, Room.objects.all(), "pk"), "room_id"),
+        "experience": (
+            partial(LookupMap, Experience.objects.all(), "pk"),
+            "experience_id",
+        ),
+    }
+
+    def after_import(self, bookings):
+        for room_pk in {booking.room_id for booking in bookings} - {None}:
+            transaction.on_commit(partial(invalidate_room_calendar, room_pk))
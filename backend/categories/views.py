@@ -1,4 +1,5 @@
 from rest_framework.viewsets import ModelViewSet
+from common.cache import cache_response
 from .models import Category
 from .serializers import CategorySerializer
 
@@ -9,3 +10,7 @@ class CategoryViewSet(ModelViewSet):
     queryset = Category.objects.filter(
         kind=Category.CategoryKindChoices.ROOMS,
     )
+
+    @cache_response(Category)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
@@ -0,0 +1,45 @@
+import logging
+import math
+from contextlib import contextmanager
+from django.db import transaction
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """
+    Run the block in a transaction that is always rolled back, so the data
+    a benchmark seeds never outlives it.
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+@contextmanager
+def quiet_access_log(level=logging.WARNING):
+    """Keep the access log to requests at `level` or above for the block."""
+    logger = logging.getLogger("access")
+    previous = logger.level
+    logger.setLevel(level)
+    try:
+        yield
+    finally:
+        logger.setLevel(previous)
+
+
+def percentile(timings, percent):
+    """
+    The nearest-rank `percent` percentile of `timings`, in any order; 0 for
+    an empty run, so a benchmark with nothing measured still reports.
+    """
+    if not timings:
+        return 0
+    ordered = sorted(timings)
+    return ordered[max(math.ceil(len(ordered) * percent / 100), 1) - 1]
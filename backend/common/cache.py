@@ -0,0 +1,177 @@
+import functools
+import hashlib
+import json
+import uuid
+from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import patch_vary_headers
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_304_NOT_MODIFIED
+from .metrics import record_cache
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Backends whose entries only the writing process sees.
+PER_PROCESS_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_is_shared():
+    """Whether every worker reads and writes the same default cache."""
+    return settings.CACHES["default"]["BACKEND"] not in PER_PROCESS_BACKENDS
+
+
+def get_version(name):
+    """
+    Current version token for `name`. Cache entries built from the data
+    `name` covers embed the token in their key, so bumping it invalidates
+    all of them at once; stale entries simply expire. Tokens themselves
+    expire after CACHE_VERSION_TIMEOUT, which bounds how long a worker that
+    missed a bump keeps serving old entries.
+    """
+    key = f"version:{name}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, settings.CACHE_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(name):
+    cache.set(f"version:{name}", uuid.uuid4().hex, settings.CACHE_VERSION_TIMEOUT)
+
+
+def get_model_version(model):
+    return get_version(f"model:{model._meta.label}")
+
+
+def bump_model_version(sender, **kwargs):
+    # After commit, so a concurrent read can't re-cache the old rows under
+    # the new version.
+    transaction.on_commit(
+        functools.partial(bump_version, f"model:{sender._meta.label}")
+    )
+
+
+def watch_model(model):
+    """Bump `model`'s cache version whenever one of its rows is saved or deleted."""
+    uid = f"cache-version:{model._meta.label}"
+    post_save.connect(bump_model_version, sender=model, dispatch_uid=uid)
+    post_delete.connect(bump_model_version, sender=model, dispatch_uid=uid)
+
+
+def make_etag(value):
+    body = json.dumps(value, sort_keys=True, default=str)
+    return quote_etag(hashlib.md5(body.encode()).hexdigest())
+
+
+def not_modified(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return False
+    return etag in (tag.strip() for tag in if_none_match.split(",")) or (
+        if_none_match.strip() == "*"
+    )
+
+
+def conditional_response(request, data, etag):
+    if not_modified(request, etag):
+        return Response(status=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(data, headers={"ETag": etag})
+
+
+def cache_response(*models, timeout=RESPONSE_CACHE_TIMEOUT):
+    """
+    Cache the serialized data of a GET handler until any row of `models`
+    changes, and answer If-None-Match with 304. No Last-Modified is sent:
+    version tokens expire and are re-created on other workers, so there is
+    no timestamp that only ever moves forward.
+
+    Only use it on views whose output doesn't depend on request.user.
+    Queryset .update() calls bypass the signals and won't invalidate.
+    """
+    for model in models:
+        watch_model(model)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            versions = [get_model_version(model) for model in models]
+            key_source = json.dumps(
+                [
+                    request.get_host(),
+                    request.path,
+                    sorted(request.query_params.lists()),
+                    versions,
+                ]
+            )
+            key = "response:" + hashlib.md5(key_source.encode()).hexdigest()
+            entry = cache.get(key)
+            if entry is None:
+                record_cache("response", misses=1)
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != HTTP_200_OK:
+                    return response
+                entry = {"data": response.data, "etag": make_etag(response.data)}
+                cache.set(key, entry, timeout)
+            else:
+                record_cache("response", hits=1)
+            return conditional_response(request, entry["data"], entry["etag"])
+
+        return wrapper
+
+    return decorator
+
+
+def related_state(related, field, timestamp="updated_at", pk="pk"):
+    """
+    Subqueries for the newest `timestamp` and the sorted pks of the rows of
+    `related` whose `field` points at the outer row. Together they change
+    whenever such a row is added, edited or removed.
+    """
+    rows = related.filter(**{field: OuterRef("pk")}).order_by().values(field)
+    return (
+        Subquery(rows.annotate(value=Max(timestamp)).values("value")),
+        Subquery(
+            rows.annotate(
+                value=ArrayAgg(pk, distinct=True, ordering=pk),
+            ).values("value")
+        ),
+    )
+
+
+def conditional_get(method):
+    """
+    Answer If-None-Match before a GET handler runs.
+
+    The view's get_fingerprint(request, *args, **kwargs) returns the state
+    the response is built from, read with one cheap query, or None to let
+    the handler run unconditionally (e.g. to raise its own 404). It must
+    cover everything the response shows, including per-user fields; its
+    hash is the ETag. No Last-Modified is sent: removals and per-user
+    changes have no timestamp, so If-Modified-Since could answer a wrong 304.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        fingerprint = self.get_fingerprint(request, *args, **kwargs)
+        if fingerprint is None:
+            return method(self, request, *args, **kwargs)
+        etag = make_etag(fingerprint)
+        if not_modified(request, etag):
+            response = Response(status=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        else:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == HTTP_200_OK:
+                response["ETag"] = etag
+        patch_vary_headers(response, ("Authorization", "Cookie"))
+        return response
+
+    return wrapper
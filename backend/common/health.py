@@ -0,0 +1,87 @@
+import logging
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Whether this worker can serve traffic: the database answers within
+    HEALTHCHECK_DB_TIMEOUT_MS, every migration on disk is applied, and the
+    cache responds.
+
+    The result is kept for HEALTHCHECK_CACHE_SECONDS, so however often
+    Kubernetes probes, each worker runs the checks at most once per period.
+    While one thread runs them, others get the previous result.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.result = None
+        self.checked_at = 0.0
+        # Migrations only move forward while a pod runs, so once they are
+        # all applied they aren't checked again.
+        self.migrated = False
+
+    def reset(self):
+        self.result = None
+        self.checked_at = 0.0
+        self.migrated = False
+
+    def get(self):
+        fresh = time.monotonic() - self.checked_at < settings.HEALTHCHECK_CACHE_SECONDS
+        if self.result is not None and fresh:
+            return self.result
+        if not self.lock.acquire(blocking=self.result is None):
+            return self.result
+        try:
+            self.result = self.run_checks()
+            self.checked_at = time.monotonic()
+            return self.result
+        finally:
+            self.lock.release()
+
+    def run_checks(self):
+        checks = {}
+        for name, check in (
+            ("database", self.check_database),
+            ("cache", self.check_cache),
+        ):
+            try:
+                check()
+                checks[name] = "ok"
+            except Exception as error:
+                logger.warning("Readiness check %s failed: %r", name, error)
+                checks[name] = type(error).__name__
+        return checks
+
+    def check_database(self):
+        connection = connections[DEFAULT_DB_ALIAS]
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                if connection.vendor == "postgresql":
+                    cursor.execute(
+                        "SET LOCAL statement_timeout = %s",
+                        [settings.HEALTHCHECK_DB_TIMEOUT_MS],
+                    )
+                cursor.execute("SELECT 1")
+            if not self.migrated:
+                executor = MigrationExecutor(connection)
+                targets = executor.loader.graph.leaf_nodes()
+                if executor.migration_plan(targets):
+                    raise RuntimeError("Unapplied migrations")
+                self.migrated = True
+            # Rolling back also drops the SET LOCAL, even when this runs
+            # inside an outer transaction (as in tests).
+            transaction.set_rollback(True)
+
+    def check_cache(self):
+        cache.get("healthcheck")
+
+
+readiness = Readiness()
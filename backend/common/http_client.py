@@ -0,0 +1,150 @@
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from urllib3.util.retry import Retry
+from . import metrics
+
+
+class UpstreamUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "An external service is unavailable, please try again."
+    default_code = "upstream_unavailable"
+
+
+class CircuitBreaker:
+    """
+    Consecutive failures of one host. After HTTP_BREAKER_FAILURES of them
+    the circuit opens and calls fail at once for HTTP_BREAKER_RESET_SECONDS,
+    instead of each holding a worker thread until it times out. Then a
+    single trial call goes through; its result closes or reopens the circuit.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < settings.HTTP_BREAKER_RESET_SECONDS or self.trial:
+                return False
+            self.trial = True
+            return True
+
+    def record(self, ok):
+        with self.lock:
+            self.trial = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if (
+                self.opened_at is not None
+                or self.failures >= settings.HTTP_BREAKER_FAILURES
+            ):
+                self.opened_at = time.monotonic()
+
+
+class HTTPClient:
+    """
+    The one requests.Session behind outbound calls, so a worker keeps its
+    TLS connections to each host (up to HTTP_POOL_MAXSIZE, for gunicorn's
+    threads) instead of handshaking on every call.
+
+    Calls get HTTP_CONNECT_TIMEOUT/HTTP_READ_TIMEOUT unless they pass their
+    own timeout, are retried by urllib3 (see settings), and go through the
+    host's CircuitBreaker. Connection errors, timeouts and 5xx answers raise
+    UpstreamUnavailable (a 503 for API views); other answers are returned.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.session = None
+        self.breakers = {}
+
+    def reset(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+            self.session = None
+            self.breakers = {}
+
+    def build_session(self):
+        retry = Retry(
+            total=settings.HTTP_RETRIES,
+            backoff_factor=settings.HTTP_RETRY_BACKOFF,
+            # A call that already waited HTTP_READ_TIMEOUT isn't waited for
+            # again, and may have reached the provider.
+            read=False,
+            # Retried for idempotent methods only; a failed connection is
+            # retried for any method, since the request was never sent.
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry, pool_maxsize=settings.HTTP_POOL_MAXSIZE
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # The session is shared by every user's requests; cookies set by one
+        # provider response must not be sent along with the next user's call.
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        return session
+
+    def get_session_and_breaker(self, host):
+        with self.lock:
+            if self.session is None:
+                self.session = self.build_session()
+            breaker = self.breakers.setdefault(host, CircuitBreaker())
+            return self.session, breaker
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).netloc
+        session, breaker = self.get_session_and_breaker(host)
+        if not breaker.allow():
+            metrics.OUTBOUND_REJECTED.labels(host).inc()
+            raise UpstreamUnavailable
+        kwargs.setdefault(
+            "timeout", (settings.HTTP_CONNECT_TIMEOUT, settings.HTTP_READ_TIMEOUT)
+        )
+        started = time.perf_counter()
+        ok = False
+        try:
+            response = session.request(method, url, **kwargs)
+            ok = response.status_code < 500
+        except requests.RequestException as error:
+            metrics.observe_outbound(
+                host, method, type(error).__name__, time.perf_counter() - started
+            )
+            raise UpstreamUnavailable from error
+        finally:
+            # Always, so a half-open trial that raised anything else still
+            # releases the circuit.
+            breaker.record(ok)
+        metrics.observe_outbound(
+            host, method, str(response.status_code), time.perf_counter() - started
+        )
+        if not ok:
+            raise UpstreamUnavailable
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+client = HTTPClient()
@@ -0,0 +1,92 @@
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from common.benchmark import percentile, quiet_access_log, rolled_back
+from common.cache import cache_is_shared
+from common.seed import Seeder
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure authenticated GET /api/v1/rooms/ throughput with the JWT user "
+        "loaded from the database on every request and with it cached by "
+        "users.authentication.CachedJWTAuthentication, which needs a shared "
+        "CACHE_URL. Data is seeded in a rolled back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=2_000)
+        parser.add_argument("--requests", type=int, default=300)
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=50,
+            help="Distinct users taking turns, so the cache holds several entries.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.options = options
+        if not cache_is_shared():
+            self.stderr.write(
+                "The default cache is per-worker, so users aren't cached; "
+                "point CACHE_URL at a shared cache to measure the difference."
+            )
+        cache.clear()
+        try:
+            with quiet_access_log(), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ), rolled_back():
+                self.run()
+        finally:
+            cache.clear()
+
+    def run(self):
+        options = self.options
+        Seeder(seed=options["seed"]).run(
+            rooms=options["rooms"], users=max(options["rooms"] // 2, options["users"])
+        )
+        users = User.objects.filter(email__startswith=f"seed{options['seed']}-")
+        clients = []
+        for user in users.order_by("pk")[: options["users"]]:
+            client = APIClient()
+            token = RefreshToken.for_user(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            clients.append(client)
+        self.stdout.write(
+            f"{'user lookup':<12} {'queries':>7} {'p50 ms':>8} {'req/s':>8}"
+        )
+        for label, timeout in (
+            ("database", 0),
+            ("cached", settings.AUTH_USER_CACHE_TIMEOUT or 300),
+        ):
+            with override_settings(AUTH_USER_CACHE_TIMEOUT=timeout):
+                # Warm-up: one request per user fills the cache.
+                for client in clients:
+                    self.get(client)
+                timings, queries = [], 0
+                started = time.perf_counter()
+                for i in range(options["requests"]):
+                    client = clients[i % len(clients)]
+                    with CaptureQueriesContext(connection) as context:
+                        request_started = time.perf_counter()
+                        self.get(client)
+                        timings.append((time.perf_counter() - request_started) * 1000)
+                    queries += len(context.captured_queries)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{label:<12} {queries / options['requests']:>7.1f} "
+                f"{percentile(timings, 50):>8.2f} "
+                f"{options['requests'] / elapsed:>8.0f}"
+            )
+
+    def get(self, client):
+        response = client.get("/api/v1/rooms/")
+        if response.status_code != 200:
+            raise CommandError(f"/api/v1/rooms/ answered {response.status_code}")
@@ -0,0 +1,137 @@
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from common.benchmark import percentile, quiet_access_log
+
+# Environment for each mode; settings.py reads these at import, so every
+# mode runs in its own process.
+MODES = {
+    "reconnect": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "60"},
+    "pool": {"DB_POOL": "1"},
+}
+
+
+def call_wsgi(handler, method, path, body=b"", content_type=""):
+    """Call a WSGI handler the way a WSGI server does; returns the status."""
+    environ = {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "testserver",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": "testserver",
+        "CONTENT_TYPE": content_type,
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+    }
+    status = []
+    response = handler(environ, lambda code, headers: status.append(code))
+    b"".join(response)
+    # Fires request_finished, which closes the connection unless
+    # CONN_MAX_AGE keeps it.
+    response.close()
+    return status[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare per-request latency with a new database connection per "
+        "request, persistent connections (CONN_MAX_AGE) and the psycopg pool. "
+        "Requests go through the real WSGI handler, so connections are opened "
+        "and closed exactly as under gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--path", default="/api/v1/rooms/")
+        parser.add_argument(
+            "--mode", choices=MODES, action="append", help="Default: all modes."
+        )
+        parser.add_argument(
+            "--child",
+            choices=MODES,
+            help="Internal: run one mode in this process and print JSON timings.",
+        )
+
+    def handle(self, *args, **options):
+        if options["child"]:
+            self.stdout.write(json.dumps(self.measure(options)))
+            return
+        results = {mode: self.spawn(mode, options) for mode in options["mode"] or MODES}
+        baseline = results.get("reconnect")
+        self.stdout.write(
+            f"{'mode':<12} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'vs reconnect':>13}"
+        )
+        for mode, timings in results.items():
+            ratio = (
+                f"{timings['mean_ms'] / baseline['mean_ms']:>12.2f}x"
+                if baseline
+                else f"{'-':>13}"
+            )
+            self.stdout.write(
+                f"{mode:<12} {timings['p50_ms']:>8.2f} {timings['p95_ms']:>8.2f} "
+                f"{timings['mean_ms']:>8.2f} {ratio}"
+            )
+
+    def spawn(self, mode, options):
+        env = {
+            **os.environ,
+            **MODES[mode],
+            # The same database as this process (the test database in tests).
+            "POSTGRES_DB": connections["default"].settings_dict["NAME"],
+        }
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "django",
+                "benchmark_connections",
+                "--child",
+                mode,
+                "--requests",
+                str(options["requests"]),
+                "--path",
+                options["path"],
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if process.returncode:
+            raise CommandError(f"{mode}: {process.stderr.strip()}")
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def measure(self, options):
+        handler = WSGIHandler()
+        timings = []
+        with quiet_access_log(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            # A few warm-up requests fill caches and open the pool.
+            for i in range(options["requests"] + 5):
+                started = time.perf_counter()
+                status = call_wsgi(handler, "GET", options["path"])
+                if not status.startswith("200"):
+                    raise CommandError(f"{options['path']} answered {status}")
+                if i >= 5:
+                    timings.append((time.perf_counter() - started) * 1000)
+        for connection in connections.all():
+            if connection.settings_dict["OPTIONS"].get("pool"):
+                connection.close_pool()
+        return {
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+        }
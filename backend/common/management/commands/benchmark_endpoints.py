@@ -0,0 +1,215 @@
+import json
+import time
+from datetime import timedelta
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from common.benchmark import percentile, quiet_access_log, rolled_back
+from common.seed import SEED_PASSWORD, Seeder
+from users.models import User
+from rooms.models import Room
+from categories.models import Category
+from wishlists.models import Wishlist
+
+BUDGETS = Path(__file__).resolve().parents[2] / "benchmark_budgets.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed data in a rolled back transaction, call every API route with the "
+        "test client, and compare p50/p95 latency and SQL query counts with "
+        "the budgets in common/benchmark_budgets.json. Fails when a budget is "
+        "exceeded; --update rewrites the budgets from this run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=2_000)
+        parser.add_argument("--runs", type=int, default=30)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--budgets", default=str(BUDGETS))
+        parser.add_argument(
+            "--queries-only",
+            action="store_true",
+            help="Only check query counts (latency depends on the machine).",
+        )
+        parser.add_argument("--update", action="store_true")
+        parser.add_argument(
+            "--headroom",
+            type=float,
+            default=3.0,
+            help="With --update, latency budget = measured p95 x headroom.",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        cache.clear()
+        # Keep the access log to requests that break its thresholds.
+        try:
+            with quiet_access_log(), override_settings(
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ), rolled_back():
+                results = self.run()
+        finally:
+            cache.clear()
+        self.check_budgets(results)
+
+    def run(self):
+        Seeder(
+            seed=self.options["seed"],
+            batch_size=5_000,
+            log=self.stdout.write if self.options["verbosity"] > 1 else None,
+        ).run(rooms=self.options["rooms"], users=max(self.options["rooms"] // 2, 10))
+        results = {}
+        self.stdout.write(
+            f"{'endpoint':<28} {'queries':>7} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+        for name, method, url, data, user, headers in self.scenarios():
+            client = APIClient(**headers)
+            if user is not None:
+                token = RefreshToken.for_user(user).access_token
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            request = getattr(client, method)
+            # One warm-up call fills caches and lazy imports.
+            self.call(request, name, url, data)
+            timings, queries = [], 0
+            for _ in range(self.options["runs"]):
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    self.call(request, name, url, data)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries = max(queries, len(context.captured_queries))
+            results[name] = {
+                "queries": queries,
+                "p50_ms": round(percentile(timings, 50), 2),
+                "p95_ms": round(percentile(timings, 95), 2),
+            }
+            self.stdout.write(
+                f"{name:<28} {queries:>7} {results[name]['p50_ms']:>8.2f} "
+                f"{results[name]['p95_ms']:>8.2f}"
+            )
+        return results
+
+    def call(self, request, name, url, data):
+        if request.__name__ == "post":
+            response = request(url, data, format="json")
+        else:
+            response = request(url, data)
+        if response.status_code >= 400:
+            raise CommandError(f"{name}: {url} answered {response.status_code}")
+        return response
+
+    def scenarios(self):
+        seeded = User.objects.filter(email__startswith=f"seed{self.options['seed']}-")
+        wishlist = Wishlist.objects.filter(user__in=seeded).earliest("pk")
+        guest = wishlist.user
+        room = Room.objects.filter(owner__in=seeded).earliest("pk")
+        category = Category.objects.filter(
+            kind=Category.CategoryKindChoices.ROOMS
+        ).earliest("pk")
+        check_in = timezone.localtime(timezone.now()).date() + timedelta(days=400)
+        dates = {"check_in": check_in, "check_out": check_in + timedelta(days=3)}
+        rooms = "/api/v1/rooms/"
+        detail = f"{rooms}{room.pk}"
+        etag = APIClient().get(detail)["ETag"]
+        # With fewer rooms than a page there is no page 2; page 1 stands in.
+        cursor = APIClient().get(rooms).data["next"] or rooms
+        return (
+            ("healthz", "get", "/healthz/ready", None, None, {}),
+            ("healthz live", "get", "/healthz/live", None, None, {}),
+            ("rooms list", "get", rooms, None, None, {}),
+            ("rooms list as guest", "get", rooms, None, guest, {}),
+            ("rooms list page 2", "get", cursor, None, None, {}),
+            ("rooms full-text", "get", rooms, {"q": room.city}, None, {}),
+            (
+                "rooms search",
+                "get",
+                f"{rooms}search",
+                {"city": room.city, **dates},
+                None,
+                {},
+            ),
+            ("room detail", "get", detail, None, None, {}),
+            ("room detail as guest", "get", detail, None, guest, {}),
+            (
+                "room detail 304",
+                "get",
+                detail,
+                None,
+                None,
+                {"HTTP_IF_NONE_MATCH": etag},
+            ),
+            ("room reviews", "get", f"{detail}/reviews", None, None, {}),
+            ("room bookings", "get", f"{detail}/bookings", None, None, {}),
+            ("room booking check", "get", f"{detail}/bookings/check", dates, None, {}),
+            ("room calendar", "get", f"{detail}/calendar", None, None, {}),
+            ("amenities", "get", f"{rooms}amenities/", None, None, {}),
+            ("experiences", "get", "/api/v1/experiences/", None, None, {}),
+            ("perks", "get", "/api/v1/experiences/perks/", None, None, {}),
+            ("categories", "get", "/api/v1/categories/", None, None, {}),
+            (
+                "category detail",
+                "get",
+                f"/api/v1/categories/{category.pk}",
+                None,
+                None,
+                {},
+            ),
+            ("wishlists", "get", "/api/v1/wishlists/", None, guest, {}),
+            (
+                "wishlist detail",
+                "get",
+                f"/api/v1/wishlists/{wishlist.pk}",
+                None,
+                guest,
+                {},
+            ),
+            ("me", "get", "/api/v1/auth/me", None, guest, {}),
+            ("public user", "get", f"/api/v1/auth/@{guest.username}", None, None, {}),
+            (
+                "login",
+                "post",
+                "/api/v1/auth/login",
+                {"email": guest.email, "password": SEED_PASSWORD},
+                None,
+                {},
+            ),
+        )
+
+    def check_budgets(self, results):
+        path = Path(self.options["budgets"])
+        if self.options["update"]:
+            headroom = self.options["headroom"]
+            budgets = {
+                name: {
+                    "queries": result["queries"],
+                    "p95_ms": round(max(result["p95_ms"] * headroom, 5), 1),
+                }
+                for name, result in results.items()
+            }
+            path.write_text(json.dumps(budgets, indent=2, ensure_ascii=False) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
+            return
+        budgets = json.loads(path.read_text())
+        failures = []
+        for name, result in results.items():
+            budget = budgets.get(name)
+            if budget is None:
+                failures.append(f"{name}: no budget (run with --update)")
+                continue
+            if result["queries"] > budget["queries"]:
+                failures.append(
+                    f"{name}: {result['queries']} queries > {budget['queries']}"
+                )
+            if not self.options["queries_only"] and result["p95_ms"] > budget["p95_ms"]:
+                failures.append(
+                    f"{name}: p95 {result['p95_ms']}ms > {budget['p95_ms']}ms"
+                )
+        if failures:
+            raise CommandError("Budget exceeded:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS("All endpoints within budget."))
@@ -0,0 +1,122 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers, make_password
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from common.benchmark import percentile, quiet_access_log
+from users.models import User
+from .benchmark_connections import call_wsgi
+
+PASSWORD = "benchmark-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Log in from --concurrency threads at once through the WSGI handler, "
+        "as gunicorn's threaded workers would, and report throughput and "
+        "latency per password hasher. Creates and deletes its own users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument(
+            "--hasher",
+            action="append",
+            help="Algorithm (argon2, pbkdf2_sha256, ...). Default: all configured.",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.stdout.write(
+            f"{'hasher':<16} {'threads':>7} {'req/s':>7} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'busy':>5}"
+        )
+        for path, hasher in zip(settings.PASSWORD_HASHERS, get_hashers()):
+            if options["hasher"] and hasher.algorithm not in options["hasher"]:
+                continue
+            # The measured hasher first, so logins don't upgrade the hashes.
+            ordered = [
+                path,
+                *(other for other in settings.PASSWORD_HASHERS if other != path),
+            ]
+            with quiet_access_log(logging.ERROR), override_settings(
+                PASSWORD_HASHERS=ordered, ALLOWED_HOSTS=["testserver"]
+            ):
+                result = self.measure()
+            self.stdout.write(
+                f"{hasher.algorithm:<16} {options['concurrency']:>7} "
+                f"{result['rps']:>7.1f} {result['p50_ms']:>8.1f} "
+                f"{result['p95_ms']:>8.1f} {result['busy']:>5}"
+            )
+
+    def measure(self):
+        options = self.options
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create(
+            User(
+                email=f"benchmark-login-{i}@example.com",
+                username=f"benchmark_login_{i}",
+                password=password,
+            )
+            for i in range(options["users"])
+        )
+        handler = WSGIHandler()
+        bodies = [
+            json.dumps({"email": user.email, "password": PASSWORD}).encode()
+            for user in users
+        ]
+        counter = iter(range(options["requests"]))
+        lock = threading.Lock()
+        timings, busy = [], []
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        i = next(counter, None)
+                    if i is None:
+                        return
+                    started = time.perf_counter()
+                    status = call_wsgi(
+                        handler,
+                        "POST",
+                        "/api/v1/auth/login",
+                        bodies[i % len(bodies)],
+                        "application/json",
+                    )
+                    elapsed = (time.perf_counter() - started) * 1000
+                    if status.startswith("503"):
+                        busy.append(elapsed)
+                    elif status.startswith("200"):
+                        timings.append(elapsed)
+                    else:
+                        raise CommandError(f"Login answered {status}")
+            finally:
+                connections.close_all()
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(options["concurrency"]) as pool:
+                for future in [
+                    pool.submit(worker) for _ in range(options["concurrency"])
+                ]:
+                    future.result()
+            elapsed = time.perf_counter() - started
+        finally:
+            OutstandingToken.objects.filter(user__in=users).delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+        return {
+            "rps": len(timings) / elapsed,
+            "p50_ms": percentile(timings, 50),
+            "p95_ms": percentile(timings, 95),
+            "busy": len(busy),
+        }
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from rooms.models import Room
+from experiences.models import Experience
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search_vector of every room and experience."
+
+    def handle(self, *args, **options):
+        for model in (Room, Experience):
+            count = model.objects.update_search_vector()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuilt {count} {model._meta.verbose_name_plural} search vectors."
+                )
+            )
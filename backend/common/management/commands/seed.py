@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from common.seed import SEED_PASSWORD, Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with deterministic synthetic users, rooms, "
+        "amenities, photos, reviews, bookings, wishlists and messages. "
+        "--rooms 1000 writes ~15k rows; --rooms 700000 about 10M."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=1_000)
+        parser.add_argument(
+            "--users", type=int, help="Defaults to half the number of rooms."
+        )
+        parser.add_argument("--photos-per-room", type=int, default=3)
+        parser.add_argument("--reviews-per-room", type=int, default=4)
+        parser.add_argument("--bookings-per-room", type=int, default=4)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        seeder = Seeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write,
+        )
+        if seeder.exists():
+            raise CommandError(
+                f"Seed {options['seed']} is already loaded; pick another --seed."
+            )
+        with transaction.atomic():
+            seeder.run(
+                rooms=options["rooms"],
+                users=options["users"] or max(options["rooms"] // 2, 10),
+                photos=options["photos_per_room"],
+                reviews=options["reviews_per_room"],
+                bookings=options["bookings_per_room"],
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Done. Users log in as {seeder.email(0)} ... "
+                f"with password {SEED_PASSWORD!r}."
+            )
+        )
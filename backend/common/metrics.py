@@ -0,0 +1,107 @@
+import os
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# Under gunicorn every worker is its own process. With PROMETHEUS_MULTIPROC_DIR
+# set (see the Dockerfile) prometheus_client keeps each worker's values in
+# mmapped files in that directory, and /metrics sums them at scrape time, so
+# whichever worker answers the scrape reports the whole pod.
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+if MULTIPROCESS:
+    # Management commands run without gunicorn's on_starting hook.
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Requests that didn't match a URL pattern share one label, so scanners can't
+# blow up the number of series.
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from the first middleware to the response, per route.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSES = Counter(
+    "http_responses",
+    "Responses per route and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled right now.",
+    multiprocess_mode="livesum",
+)
+REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL queries run by one request, per route.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 20, 30, 50, 100),
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time one request spent waiting on SQL queries, per route.",
+    ["route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "Cache lookups per cache and result (hit or miss).",
+    ["cache", "result"],
+)
+OUTBOUND_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Time outbound HTTP calls took, retries included, per host and outcome "
+    "(status code or error).",
+    ["host", "method", "outcome"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+OUTBOUND_REJECTED = Counter(
+    "http_client_circuit_open",
+    "Outbound calls refused without trying because the host's circuit is open.",
+    ["host"],
+)
+# One series per worker: in multiprocess mode the collector adds a "pid"
+# label, which tells the workers apart and shows when one was restarted.
+WORKER_START_TIME = Gauge(
+    "worker_start_time_seconds",
+    "Unix time the worker process loaded the app.",
+    multiprocess_mode="all",
+)
+WORKER_START_TIME.set_to_current_time()
+
+
+def observe_request(method, route, status, duration, db_queries, db_duration):
+    route = route or UNMATCHED_ROUTE
+    REQUEST_DURATION.labels(method, route).observe(duration)
+    RESPONSES.labels(method, route, status).inc()
+    REQUEST_DB_QUERIES.labels(route).observe(db_queries)
+    REQUEST_DB_DURATION.labels(route).observe(db_duration)
+
+
+def record_cache(name, hits=0, misses=0):
+    if hits:
+        CACHE_REQUESTS.labels(name, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(name, "miss").inc(misses)
+
+
+def observe_outbound(host, method, outcome, duration):
+    OUTBOUND_DURATION.labels(host, method, outcome).observe(duration)
+
+
+def render():
+    """The text exposition of every metric, and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -1,30 +1,129 @@
 # common/middleware.py
 
+import json
 import logging
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, JsonResponse
+from . import metrics
+from .health import readiness
 
 # 'access' 로거는 settings.py에서 정의한 로거 이름
 access_logger = logging.getLogger("access")
 
 
-class AccessLogMiddleware:
+class HealthCheckMiddleware:
+    """
+    Answers the Kubernetes probes and Prometheus scrapes before any other
+    middleware runs: no ALLOWED_HOSTS check (kubelet and Prometheus send the
+    pod IP as Host), no session or JWT authentication, no access log line.
+
+    /healthz/live only proves the worker handles requests.
+    /healthz/ready runs common.health.Readiness and answers 503 if a check
+    failed, so the pod is taken out of the Service until it recovers.
+    /metrics is the scrape target (common.metrics.render); the ingress
+    doesn't route it from outside.
+    """
+
+    LIVE = ("/healthz/live", "/healthz/live/")
+    READY = ("/healthz/ready", "/healthz/ready/")
+    METRICS = ("/metrics", "/metrics/")
+
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        # 요청 처리 전에 로그를 남길 수 있음 (필요 시)
+        if request.path in self.LIVE:
+            return JsonResponse({"status": "ok"})
+        if request.path in self.READY:
+            checks = readiness.get()
+            ready = all(result == "ok" for result in checks.values())
+            return JsonResponse(
+                {"status": "ok" if ready else "unavailable", "checks": checks},
+                status=200 if ready else 503,
+            )
+        if request.path in self.METRICS:
+            body, content_type = metrics.render()
+            return HttpResponse(body, content_type=content_type)
+        return self.get_response(request)
+
+
+class QueryStats:
+    """connection.execute_wrapper that counts queries and their total time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
 
-        response = self.get_response(request)
 
-        # 응답 후에 로그 남기기
-        # User-Agent, IP 등 필요한 정보를 추가할 수 있음
+class AccessLogMiddleware:
+    """
+    One JSON line per request on the "access" logger: wall time, SQL query
+    count and time, response size and the matched view. Requests over
+    ACCESS_LOG_SLOW_MS or ACCESS_LOG_MAX_QUERIES are logged as warnings
+    with the exceeded limits in "flags", which makes N+1 regressions easy
+    to grep for. The same numbers feed the Prometheus histograms in
+    common/metrics.py.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            stack.enter_context(metrics.REQUESTS_IN_PROGRESS.track_inprogress())
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+        duration_ms = duration * 1000
+
+        match = request.resolver_match
+        metrics.observe_request(
+            request.method,
+            match.route if match else None,
+            response.status_code,
+            duration,
+            stats.count,
+            stats.duration,
+        )
+        # DRF stores the authenticated user on the Django request too, so
+        # this doesn't cost a query for API views.
+        user = getattr(request, "user", None)
         log_data = {
-            "user": (
-                request.user.username if request.user.is_authenticated else "anonymous"
-            ),
             "method": request.method,
             "path": request.get_full_path(),
+            "view": (match.view_name or match._func_path) if match else None,
+            "route": match.route if match else None,
             "status_code": response.status_code,
+            "user": user.pk if user is not None and user.is_authenticated else None,
+            "duration_ms": round(duration_ms, 2),
+            "db_queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 2),
+            "bytes": None if response.streaming else len(response.content),
         }
-        access_logger.info(log_data)
+        flags = []
+        if duration_ms > settings.ACCESS_LOG_SLOW_MS:
+            flags.append("slow")
+        if stats.count > settings.ACCESS_LOG_MAX_QUERIES:
+            flags.append("queries")
+        if flags:
+            log_data["flags"] = flags
+        access_logger.log(
+            logging.WARNING if flags else logging.INFO,
+            json.dumps(log_data, ensure_ascii=False),
+        )
 
         return response
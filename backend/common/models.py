@@ -7,3 +7,28 @@ class CommonModel(models.Model):
 
     class Meta:
         abstract = True
+
+
+class RatedModel(models.Model):
+    """Keeps a running review count and rating sum so averages need no query.
+
+    The counters are maintained by the review signals in reviews/signals.py
+    and can be rebuilt with `manage.py sync_review_aggregates`.
+    """
+
+    review_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def rating(self):
+        if self.review_count == 0:
+            return 0
+        return round(self.rating_sum / self.review_count, 2)
@@ -0,0 +1,165 @@
+import base64
+import json
+from datetime import datetime
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import BooleanField, DateTimeField, F, Func, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowComparison(Func):
+    """
+    `(a, b) < (x, y)` as one row-value comparison. Unlike the equivalent
+    `a < x OR (a = x AND b < y)`, PostgreSQL uses it as the start of an
+    index range scan on (a, b).
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, fields, operator, values):
+        self.operator = operator
+        super().__init__(*map(F, fields), *map(Value, values))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        parts, params = [], []
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            parts.append(sql)
+            params.extend(expression_params)
+        half = len(parts) // 2
+        return (
+            f"({', '.join(parts[:half])}) {self.operator} ({', '.join(parts[half:])})",
+            params,
+        )
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (created_at, pk), newest first.
+
+    Each page is fetched with a `WHERE (created_at, pk) < cursor` range scan
+    instead of OFFSET, so page N costs the same as page 1. The cursor token is
+    opaque to clients; they only follow the `next` / `previous` links.
+    `ordering` may name an annotation instead (e.g. a search rank).
+    """
+
+    cursor_query_param = "cursor"
+    ordering = ("created_at", "pk")
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size=None, ordering=None):
+        self.page_size = page_size or settings.PAGE_SIZE
+        if ordering is not None:
+            self.ordering = ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            cursor["position"] = self.parse_position(queryset, cursor["position"])
+        reverse = cursor is not None and cursor["reverse"]
+        field, tiebreaker = self.ordering
+
+        if reverse:
+            queryset = queryset.order_by(field, tiebreaker)
+        else:
+            queryset = queryset.order_by(f"-{field}", f"-{tiebreaker}")
+        if cursor is not None:
+            queryset = queryset.filter(
+                RowComparison(
+                    (field, tiebreaker),
+                    ">" if reverse else "<",
+                    (cursor["position"], cursor["pk"]),
+                )
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(),
+                self.cursor_query_param,
+            )
+        return self.build_link(self.page[0], reverse=True)
+
+    def build_link(self, instance, reverse):
+        field, tiebreaker = self.ordering
+        token = self.encode_cursor(
+            getattr(instance, field),
+            getattr(instance, tiebreaker),
+            reverse,
+        )
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            token,
+        )
+
+    def encode_cursor(self, position, pk, reverse):
+        if isinstance(position, datetime):
+            position = position.isoformat()
+        payload = json.dumps(
+            [position, pk, int(reverse)],
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padding = "=" * (-len(token) % 4)
+            position, pk, reverse = json.loads(
+                base64.urlsafe_b64decode(token + padding)
+            )
+            return {
+                "position": position,
+                "pk": int(pk),
+                "reverse": bool(reverse),
+            }
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_position(self, queryset, position):
+        try:
+            field = queryset.model._meta.get_field(self.ordering[0])
+        except FieldDoesNotExist:
+            field = None
+        try:
+            if isinstance(field, DateTimeField):
+                return datetime.fromisoformat(position)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if isinstance(position, bool) or not isinstance(position, (int, float)):
+            raise NotFound(self.invalid_cursor_message)
+        return position
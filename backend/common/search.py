@@ -0,0 +1,172 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+# PostgreSQL has no Korean stemmer, so "simple" keeps every token as written.
+# Partial words (강남 in 강남역) are caught by the trigram fallback.
+SEARCH_CONFIG = "simple"
+
+
+class SearchableQuerySet(models.QuerySet):
+    """
+    Full-text search over a maintained `search_vector` column.
+
+    Subclasses list their own `search_fields` as (field, weight) pairs and
+    `search_related` as (m2m field, related field, weight) triples.
+    """
+
+    search_fields = ()
+    search_related = ()
+    trigram_field = "name"
+
+    def build_search_vector(self):
+        parts = [
+            SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+            for field, weight in self.search_fields
+        ]
+        for relation, related_field, weight in self.search_related:
+            m2m = self.model._meta.get_field(relation)
+            source = m2m.m2m_field_name()
+            target = m2m.m2m_reverse_field_name()
+            names = (
+                m2m.remote_field.through.objects.filter(
+                    **{source: models.OuterRef("pk")}
+                )
+                .order_by()
+                .values(source)
+                .annotate(names=StringAgg(f"{target}__{related_field}", delimiter=" "))
+                .values("names")
+            )
+            parts.append(
+                SearchVector(
+                    models.Subquery(names, output_field=models.TextField()),
+                    weight=weight,
+                    config=SEARCH_CONFIG,
+                )
+            )
+        vector = parts[0]
+        for part in parts[1:]:
+            vector = vector + part
+        return vector
+
+    def update_search_vector(self):
+        return self.update(search_vector=self.build_search_vector())
+
+    def search(self, text):
+        """
+        Rows matching `text` in the search vector (GIN) or with a name that
+        contains a word similar to it (trigram GIN), annotated with `rank`.
+        """
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        return self.filter(
+            models.Q(search_vector=query)
+            | models.Q(**{f"{self.trigram_field}__trigram_word_similar": text})
+        ).annotate(
+            rank=SearchRank(models.F("search_vector"), query)
+            + TrigramWordSimilarity(text, self.trigram_field),
+        )
+
+
+def connect_search_vector_signals(model):
+    """
+    Refresh `model.search_vector` whenever one of its search fields, one of
+    its search relations, or a related row's name changes.
+    """
+    queryset = model.objects.all()
+    own_fields = {field for field, _ in queryset.search_fields}
+    label = model._meta.label
+
+    def refresh(pks):
+        model.objects.filter(pk__in=pks).update_search_vector()
+
+    def on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+        if raw or (update_fields is not None and not own_fields & set(update_fields)):
+            return
+        refresh([instance.pk])
+
+    post_save.connect(
+        on_save,
+        sender=model,
+        weak=False,
+        dispatch_uid=f"search-vector:{label}",
+    )
+
+    for relation, related_field, _ in queryset.search_related:
+        m2m = model._meta.get_field(relation)
+
+        def related_pks(instance, relation=relation):
+            return list(
+                model.objects.filter(**{relation: instance}).values_list(
+                    "pk", flat=True
+                )
+            )
+
+        def on_m2m_changed(
+            sender, instance, action, reverse, pk_set, related_pks=related_pks, **kwargs
+        ):
+            if not reverse:
+                if action in ("post_add", "post_remove", "post_clear"):
+                    refresh([instance.pk])
+            elif action == "pre_clear":
+                instance._search_vector_pks = related_pks(instance)
+            elif action in ("post_add", "post_remove"):
+                refresh(pk_set)
+            elif action == "post_clear":
+                refresh(instance._search_vector_pks)
+
+        def on_related_save(
+            sender,
+            instance,
+            created,
+            raw=False,
+            update_fields=None,
+            relation=relation,
+            related_field=related_field,
+            **kwargs,
+        ):
+            # A brand new row isn't attached to anything yet.
+            if raw or created:
+                return
+            if update_fields is not None and related_field not in update_fields:
+                return
+            # A single UPDATE joined through the m2m table, rather than
+            # fetching every linked pk and sending them back.
+            model.objects.filter(**{relation: instance}).update_search_vector()
+
+        def on_related_pre_delete(sender, instance, related_pks=related_pks, **kwargs):
+            instance._search_vector_pks = related_pks(instance)
+
+        def on_related_post_delete(sender, instance, **kwargs):
+            refresh(getattr(instance, "_search_vector_pks", []))
+
+        uid = f"search-vector:{label}.{relation}"
+        m2m_changed.connect(
+            on_m2m_changed,
+            sender=m2m.remote_field.through,
+            weak=False,
+            dispatch_uid=uid,
+        )
+        post_save.connect(
+            on_related_save,
+            sender=m2m.related_model,
+            weak=False,
+            dispatch_uid=uid,
+        )
+        pre_delete.connect(
+            on_related_pre_delete,
+            sender=m2m.related_model,
+            weak=False,
+            dispatch_uid=uid,
+        )
+        post_delete.connect(
+            on_related_post_delete,
+            sender=m2m.related_model,
+            weak=False,
+            dispatch_uid=uid,
+        )
@@ -0,0 +1,325 @@
+import random
+import time
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.utils import timezone
+from users.models import User
+from categories.models import Category
+from rooms.models import Amenity, Room
+from medias.models import Photo
+from reviews.models import Review
+from reviews.aggregates import sync_aggregates_for
+from bookings.models import Booking
+from wishlists.models import Wishlist
+from direct_messages.models import ChattingRoom, Message
+from .transfer import batched
+
+# Every seeded user can log in with this password.
+SEED_PASSWORD = "seed-password"
+
+CITIES = (
+    ("서울", 0.4),
+    ("부산", 0.15),
+    ("제주", 0.15),
+    ("인천", 0.08),
+    ("강릉", 0.07),
+    ("대구", 0.05),
+    ("광주", 0.05),
+    ("대전", 0.05),
+)
+ADJECTIVES = ("Cozy", "Modern", "Quiet", "Sunny", "Spacious", "Traditional", "Bright")
+PLACES = ("Hanok", "Apartment", "Studio", "Loft", "Villa", "Guesthouse", "Cabin")
+VIEWS = ("오션뷰", "시티뷰", "마운틴뷰", "리버뷰", "역세권", "한옥마을")
+AMENITIES = (
+    "Wifi",
+    "Kitchen",
+    "Washer",
+    "Dryer",
+    "Air conditioning",
+    "Heating",
+    "Parking",
+    "Pool",
+    "Hot tub",
+    "Sauna",
+    "TV",
+    "Workspace",
+    "Elevator",
+    "Gym",
+    "Breakfast",
+    "Fireplace",
+    "BBQ grill",
+    "Balcony",
+    "Ocean view",
+    "Pet friendly",
+)
+CATEGORIES = ("Hanok", "Beach", "Countryside", "City", "Mountain", "Island")
+WORDS = (
+    "great",
+    "clean",
+    "host",
+    "location",
+    "quiet",
+    "view",
+    "again",
+    "recommend",
+    "깨끗",
+    "친절",
+    "위치",
+    "최고",
+)
+
+
+class Seeder:
+    """
+    Deterministic synthetic data at configurable scale.
+
+    Rows are generated lazily and written with bulk_create in `batch_size`
+    chunks. The same `seed` always yields the same rows (apart from pks and
+    timestamps), and its users are namespaced by it, so different seeds can
+    share a database.
+    """
+
+    def __init__(self, seed=0, batch_size=5_000, log=None):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.today = timezone.localtime(timezone.now()).date()
+
+    def email(self, i):
+        return f"seed{self.seed}-user{i}@example.com"
+
+    def exists(self):
+        return User.objects.filter(email=self.email(0)).exists()
+
+    def create(self, model, rows):
+        started = time.perf_counter()
+        pks = []
+        for batch in batched(rows, self.batch_size):
+            pks += [obj.pk for obj in model.objects.bulk_create(batch)]
+        self.report(model._meta.db_table, len(pks), started)
+        return pks
+
+    def link(self, field, pairs):
+        """Bulk insert (source pk, target pk) pairs into an m2m through table."""
+        started = time.perf_counter()
+        through = field.remote_field.through
+        source = f"{field.m2m_field_name()}_id"
+        target = f"{field.m2m_reverse_field_name()}_id"
+        count = 0
+        for batch in batched(pairs, self.batch_size):
+            through.objects.bulk_create(
+                [through(**{source: a, target: b}) for a, b in batch]
+            )
+            count += len(batch)
+        self.report(through._meta.db_table, count, started)
+
+    def report(self, label, count, started):
+        elapsed = time.perf_counter() - started
+        self.log(
+            f"{label:<36} {count:>10} rows "
+            f"{count / elapsed if elapsed else 0:>10.0f} rows/s"
+        )
+
+    def sample(self, pks, k):
+        return self.random.sample(pks, min(k, len(pks)))
+
+    # Tables
+
+    def users(self, count):
+        password = make_password(SEED_PASSWORD)
+        return self.create(
+            User,
+            (
+                User(
+                    email=self.email(i),
+                    username=f"seed{self.seed}_{i}",
+                    password=password,
+                    gender=self.random.choice(User.GenderChoices.values),
+                    language=self.random.choice(User.LanguageChoices.values),
+                    currency=self.random.choice(User.CurrencyChoices.values),
+                )
+                for i in range(count)
+            ),
+        )
+
+    def amenities(self):
+        names = set(Amenity.objects.values_list("name", flat=True))
+        self.create(
+            Amenity,
+            (Amenity(name=name) for name in AMENITIES if name not in names),
+        )
+        return list(
+            Amenity.objects.filter(name__in=AMENITIES)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def categories(self):
+        kind = Category.CategoryKindChoices.ROOMS
+        names = set(Category.objects.filter(kind=kind).values_list("name", flat=True))
+        self.create(
+            Category,
+            (
+                Category(name=name, kind=kind)
+                for name in CATEGORIES
+                if name not in names
+            ),
+        )
+        return list(
+            Category.objects.filter(kind=kind, name__in=CATEGORIES)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    def rooms(self, count, hosts, categories):
+        cities, weights = zip(*CITIES)
+
+        def rows():
+            for i in range(count):
+                city = self.random.choices(cities, weights)[0]
+                name = (
+                    f"{self.random.choice(ADJECTIVES)} {self.random.choice(PLACES)} "
+                    f"{city} {self.random.choice(VIEWS)}"
+                )
+                yield Room(
+                    name=name,
+                    city=city,
+                    price=self.random.randrange(30_000, 500_000, 1_000),
+                    rooms=self.random.randint(1, 5),
+                    toilets=self.random.randint(1, 3),
+                    description=f"{name} near {city} station, room {i}.",
+                    address=f"{city} {self.random.randint(1, 999)}",
+                    pet_friendly=self.random.random() < 0.3,
+                    kind=self.random.choice(Room.RoomKindChoices.values),
+                    owner_id=self.random.choice(hosts),
+                    category_id=self.random.choice(categories),
+                )
+
+        return self.create(Room, rows())
+
+    def room_amenities(self, rooms, amenities):
+        self.link(
+            Room._meta.get_field("amenities"),
+            (
+                (room, amenity)
+                for room in rooms
+                for amenity in self.sample(amenities, self.random.randint(2, 8))
+            ),
+        )
+
+    def photos(self, rooms, per_room):
+        self.create(
+            Photo,
+            (
+                Photo(
+                    file=f"https://picsum.photos/seed/{room}-{i}/800/600",
+                    description=f"Photo {i}",
+                    room_id=room,
+                )
+                for room in rooms
+                for i in range(per_room)
+            ),
+        )
+
+    def reviews(self, rooms, users, per_room):
+        self.create(
+            Review,
+            (
+                Review(
+                    user_id=self.random.choice(users),
+                    room_id=room,
+                    payload=" ".join(self.random.choices(WORDS, k=8)),
+                    # Skewed towards good ratings, like real listings.
+                    rating=self.random.choices((1, 2, 3, 4, 5), (1, 1, 3, 8, 12))[0],
+                )
+                for room in rooms
+                for _ in range(self.random.randint(0, 2 * per_room))
+            ),
+        )
+
+    def bookings(self, rooms, users, per_room):
+        def rows():
+            for room in rooms:
+                # Consecutive, non-overlapping stays from a year ago onwards.
+                day = self.today - timedelta(days=self.random.randrange(365))
+                for _ in range(per_room):
+                    day += timedelta(days=self.random.randrange(1, 45))
+                    nights = self.random.randint(1, 7)
+                    yield Booking(
+                        kind=Booking.BookingKindChoices.ROOM,
+                        user_id=self.random.choice(users),
+                        room_id=room,
+                        check_in=day,
+                        check_out=day + timedelta(days=nights),
+                        guests=self.random.randint(1, 4),
+                    )
+                    day += timedelta(days=nights)
+
+        self.create(Booking, rows())
+
+    def wishlists(self, users, rooms):
+        owners = self.sample(users, len(users) // 4)
+        wishlists = self.create(
+            Wishlist,
+            (Wishlist(name=f"Trip {i}", user_id=user) for i, user in enumerate(owners)),
+        )
+        self.link(
+            Wishlist._meta.get_field("rooms"),
+            (
+                (wishlist, room)
+                for wishlist in wishlists
+                for room in self.sample(rooms, self.random.randint(1, 10))
+            ),
+        )
+
+    def messages(self, users, per_chat=10):
+        pairs = [self.sample(users, 2) for _ in range(len(users) // 10)]
+        chats = self.create(ChattingRoom, (ChattingRoom() for _ in pairs))
+        self.link(
+            ChattingRoom._meta.get_field("users"),
+            ((chat, user) for chat, pair in zip(chats, pairs) for user in pair),
+        )
+        self.create(
+            Message,
+            (
+                Message(
+                    room_id=chat,
+                    user_id=self.random.choice(pair),
+                    text=" ".join(self.random.choices(WORDS, k=6)),
+                )
+                for chat, pair in zip(chats, pairs)
+                for _ in range(per_chat)
+            ),
+        )
+
+    # Everything
+
+    def run(self, rooms, users, photos=3, reviews=4, bookings=4):
+        user_pks = self.users(users)
+        # A tenth of the users host every room, like a real marketplace.
+        hosts = user_pks[: max(1, len(user_pks) // 10)]
+        User.objects.filter(pk__in=hosts).update(is_host=True)
+        amenity_pks = self.amenities()
+        category_pks = self.categories()
+        room_pks = self.rooms(rooms, hosts, category_pks)
+        self.room_amenities(room_pks, amenity_pks)
+        self.photos(room_pks, photos)
+        self.reviews(room_pks, user_pks, reviews)
+        self.bookings(room_pks, user_pks, bookings)
+        self.wishlists(user_pks, room_pks)
+        self.messages(user_pks)
+        self.finish(room_pks)
+
+    def finish(self, rooms):
+        """Redo what the signals bulk_create skipped: counters and search."""
+        started = time.perf_counter()
+        for batch in batched(rooms, self.batch_size):
+            queryset = Room.objects.filter(pk__in=batch)
+            sync_aggregates_for(queryset, "room")
+            queryset.update_search_vector()
+        self.report("aggregates + search", len(rooms), started)
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
@@ -0,0 +1,76 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubServer:
+    """
+    A local HTTP server standing in for an external API in tests.
+
+    `routes` maps "METHOD /path" to a list of (status, body) answers, used
+    in turn (the last one repeats); a callable body gets the request and
+    returns the body. Requests are recorded in `calls`, with the client port
+    so connection reuse can be checked. Use it as a context manager; `url`
+    is its base URL.
+    """
+
+    def __init__(self, routes):
+        self.routes = {key: list(answers) for key, answers in routes.items()}
+        self.calls = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def answer(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                key = f"{self.command} {self.path.split('?')[0]}"
+                with stub.lock:
+                    stub.calls.append(
+                        {
+                            "key": key,
+                            "path": self.path,
+                            "headers": self.headers,
+                            "body": body,
+                            "port": self.client_address[1],
+                        }
+                    )
+                    answers = stub.routes.get(key) or [(404, {})]
+                    status, payload = answers.pop(0) if len(answers) > 1 else answers[0]
+                if callable(payload):
+                    payload = payload(self)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = answer
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            def handle_error(self, request, client_address):
+                # Clients that gave up (timeouts) leave broken pipes behind.
+                pass
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self):
+        threading.Thread(
+            target=self.server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def called(self, key):
+        return [call for call in self.calls if call["key"] == key]
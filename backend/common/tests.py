@@ -1,3 +1,491 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+import time
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils import timezone
+from prometheus_client import REGISTRY
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from experiences.models import Perk
+from rooms.models import Amenity, Room
+from categories.models import Category
+from reviews.models import Review
+from reviews.aggregates import sync_review_aggregates
+from users.models import User
+from .health import readiness
+from .pagination import KeysetPagination
+from .transfer import LookupMap
+from .http_client import UpstreamUnavailable, client as http_client
+from .testing import StubServer
 
-# Create your tests here.
+
+@override_settings(PAGE_SIZE=2)
+class TestKeysetPagination(APITestCase):
+
+    URL = "/api/v1/experiences/perks/"
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        for i in range(5):
+            Perk.objects.create(name=f"Perk {i}")
+        # Ties on created_at must still page deterministically by pk.
+        Perk.objects.filter(name__in=["Perk 1", "Perk 2", "Perk 3"]).update(
+            created_at=now
+        )
+
+    def walk(self, url, direction):
+        names = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            names.append([perk["name"] for perk in response.data["results"]])
+            url = response.data[direction]
+        return names
+
+    def test_next_and_previous(self):
+        pages = self.walk(self.URL, "next")
+        self.assertEqual(
+            pages,
+            [["Perk 4", "Perk 0"], ["Perk 3", "Perk 2"], ["Perk 1"]],
+        )
+        last_page = self.client.get(self.URL).data
+        while last_page["next"]:
+            last_page = self.client.get(last_page["next"]).data
+        self.assertEqual(
+            self.walk(last_page["previous"], "previous"),
+            [["Perk 3", "Perk 2"], ["Perk 4", "Perk 0"]],
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.URL, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_deep_page_reads_only_the_page(self):
+        owner = User.objects.create_user(email="host@test.com")
+        Room.objects.bulk_create(
+            Room(
+                name=f"Room {i}",
+                price=1,
+                rooms=1,
+                toilets=1,
+                description="",
+                address="",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=owner,
+            )
+            for i in range(2000)
+        )
+        middle = Room.objects.order_by("pk")[1000]
+        paginator = KeysetPagination(page_size=10)
+        token = paginator.encode_cursor(middle.created_at, middle.pk, False)
+        request = Request(APIRequestFactory().get("/", {"cursor": token}))
+        with CaptureQueriesContext(connection) as context:
+            paginator.paginate_queryset(Room.objects.all(), request)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE rooms_room")
+            cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + context[-1]["sql"])
+            plan = cursor.fetchone()[0][0]["Plan"]
+        nodes = [plan]
+        for node in nodes:
+            nodes.extend(node.get("Plans", ()))
+        # An index range scan starting at the cursor, not a walk from the
+        # newest row that filters out the first 1000.
+        self.assertLessEqual(max(node["Actual Rows"] for node in nodes), 11)
+        self.assertFalse(any(node.get("Rows Removed by Filter") for node in nodes))
+
+
+class TestResponseCache(APITestCase):
+
+    URL = "/api/v1/rooms/amenities/"
+
+    def setUp(self):
+        cache.clear()
+        self.amenity = Amenity.objects.create(name="Wifi")
+
+    def test_cached_until_rows_change(self):
+        self.client.get(self.URL)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.URL)
+        self.assertEqual([a["name"] for a in response.data], ["Wifi"])
+        with self.captureOnCommitCallbacks(execute=True):
+            Amenity.objects.create(name="Sauna")
+        response = self.client.get(self.URL)
+        self.assertEqual(len(response.data), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.amenity.delete()
+        response = self.client.get(self.URL)
+        self.assertEqual([a["name"] for a in response.data], ["Sauna"])
+
+    def test_conditional_get(self):
+        response = self.client.get(self.URL)
+        etag = response["ETag"]
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn("Last-Modified", response)
+        # Answered from the ETag only, never from a date.
+        response = self.client.get(
+            self.URL, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.amenity.name = "Fast wifi"
+            self.amenity.save()
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TestImportExport(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="host@test.com")
+        self.category = Category.objects.create(
+            name="Hanok", kind=Category.CategoryKindChoices.ROOMS
+        )
+        self.wifi = Amenity.objects.create(name="Wifi")
+        self.sauna = Amenity.objects.create(name="Sauna")
+        room = Room.objects.create(
+            name="Hanok stay",
+            price=100,
+            rooms=1,
+            toilets=1,
+            description="Quiet",
+            address="Seoul",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.owner,
+            category=self.category,
+        )
+        room.amenities.add(self.wifi, self.sauna)
+
+    def round_trip(self, name, format, replace=()):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"{name}.{format}")
+            call_command(f"export_{name}", path, stderr=io.StringIO())
+            # As if importing into another database.
+            for model in replace:
+                model.objects.all().delete()
+            call_command(f"import_{name}", path, batch_size=1, stderr=io.StringIO())
+
+    def test_rooms_round_trip(self):
+        pk = Room.objects.get().pk
+        for format in ("csv", "jsonl"):
+            self.round_trip("rooms", format, replace=[Room])
+        room = Room.objects.get()
+        self.assertEqual(room.pk, pk)
+        self.assertEqual(room.owner, self.owner)
+        self.assertEqual(room.category, self.category)
+        self.assertEqual(
+            set(room.amenities.values_list("name", flat=True)), {"Wifi", "Sauna"}
+        )
+        self.assertEqual(len(Room.objects.search("hanok")), 1)
+        # The id sequence continues after the imported ids.
+        room.pk = None
+        room.save()
+        self.assertGreater(room.pk, pk)
+
+    def test_reviews_update_ratings(self):
+        room = Room.objects.get()
+        Review.objects.create(user=self.owner, room=room, payload="", rating=4)
+        self.round_trip("reviews", "csv")
+        room.refresh_from_db()
+        self.assertEqual((room.review_count, room.rating_sum), (2, 8))
+
+    def test_reviews_follow_room_ids(self):
+        room = Room.objects.get()
+        Review.objects.create(user=self.owner, room=room, payload="", rating=4)
+        names = ("rooms", "reviews")
+        with tempfile.TemporaryDirectory() as directory:
+            for name in names:
+                path = os.path.join(directory, f"{name}.csv")
+                call_command(f"export_{name}", path, stderr=io.StringIO())
+            Room.objects.all().delete()
+            for name in names:
+                path = os.path.join(directory, f"{name}.csv")
+                call_command(f"import_{name}", path, stderr=io.StringIO())
+        self.assertEqual(Review.objects.get().room.name, "Hanok stay")
+
+    def test_lookup_map_overflow_keeps_the_batch(self):
+        for name in "abc":
+            User.objects.create_user(email=f"{name}@x.com", username=name)
+        lookup = LookupMap(User.objects.all(), "email", max_size=2)
+        lookup.load({"a@x.com", "b@x.com"})
+        lookup.load({"a@x.com", "c@x.com"})
+        self.assertIsNotNone(lookup.get("a@x.com"))
+        self.assertIsNotNone(lookup.get("c@x.com"))
+
+    def test_unknown_reference_rolls_back(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl") as file:
+            file.write(
+                '{"name": "A", "price": 1, "rooms": 1, "toilets": 1, '
+                '"description": "", "address": "", "kind": "entire_place", '
+                '"owner": "host@test.com", "amenities": ["Wifi"]}\n'
+                '{"name": "B", "price": 1, "rooms": 1, "toilets": 1, '
+                '"description": "", "address": "", "kind": "entire_place", '
+                '"owner": "nobody@test.com"}\n'
+            )
+            file.flush()
+            with self.assertRaisesMessage(CommandError, "Row 2: unknown owner"):
+                call_command("import_rooms", file.name, stderr=io.StringIO())
+        self.assertEqual(Room.objects.count(), 1)
+
+
+class TestSeed(TestCase):
+    def seed(self, seed):
+        call_command("seed", rooms=30, seed=seed, stdout=io.StringIO())
+        users = User.objects.filter(email__startswith=f"seed{seed}-")
+        return list(
+            Room.objects.filter(owner__in=users)
+            .order_by("pk")
+            .values_list("name", "price", "city")
+        )
+
+    def test_deterministic_and_consistent(self):
+        first = self.seed(1)
+        self.assertEqual(len(first), 30)
+        self.assertEqual(first, self.seed_again(1))
+        self.assertNotEqual(first, self.seed(2))
+        self.assertEqual(sync_review_aggregates(), (0, 0))
+        self.assertTrue(Room.objects.search(first[0][2]).exists())
+
+    def seed_again(self, seed):
+        # Remove the earlier run so the same seed can be loaded twice.
+        User.objects.filter(email__startswith=f"seed{seed}-").delete()
+        return self.seed(seed)
+
+    def test_refuses_to_load_a_seed_twice(self):
+        self.seed(1)
+        with self.assertRaises(CommandError):
+            self.seed(1)
+
+
+class TestEndpointBudgets(TestCase):
+    def test_query_budgets(self):
+        # Latency depends on the machine; query counts must not regress.
+        call_command(
+            "benchmark_endpoints",
+            rooms=20,
+            runs=2,
+            queries_only=True,
+            stdout=io.StringIO(),
+        )
+
+
+class TestAccessLog(APITestCase):
+
+    URL = "/api/v1/rooms/amenities/"
+
+    def setUp(self):
+        cache.clear()
+        Amenity.objects.create(name="Wifi")
+
+    def get_log(self):
+        with self.assertLogs("access") as logs:
+            self.client.get(self.URL)
+        (record,) = logs.records
+        return record.levelname, json.loads(record.getMessage())
+
+    def test_json_line(self):
+        level, line = self.get_log()
+        self.assertEqual(level, "INFO")
+        self.assertEqual(line["route"], "api/v1/rooms/amenities/")
+        self.assertEqual(line["view"], "rooms.views.Amenities")
+        self.assertEqual(line["status_code"], 200)
+        self.assertGreater(line["db_queries"], 0)
+        self.assertGreater(line["bytes"], 0)
+
+    @override_settings(ACCESS_LOG_MAX_QUERIES=0, ACCESS_LOG_SLOW_MS=0)
+    def test_flags_expensive_requests(self):
+        level, line = self.get_log()
+        self.assertEqual(level, "WARNING")
+        self.assertEqual(line["flags"], ["slow", "queries"])
+
+
+class TestMetrics(APITestCase):
+
+    URL = "/api/v1/rooms/amenities/"
+
+    def setUp(self):
+        cache.clear()
+        Amenity.objects.create(name="Wifi")
+
+    def scrape(self):
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def sample(self, text, name, **labels):
+        prefix = name + "{" + ",".join(f'{k}="{v}"' for k, v in labels.items())
+        for line in text.splitlines():
+            if line.startswith(prefix):
+                return float(line.rsplit(" ", 1)[1])
+        return 0.0
+
+    def test_request_db_and_cache_metrics(self):
+        before = self.scrape()
+        self.client.get(self.URL)
+        self.client.get(self.URL)
+        after = self.scrape()
+        route = {"route": "api/v1/rooms/amenities/"}
+        for name, labels, delta in (
+            ("http_request_duration_seconds_count", {"method": "GET", **route}, 2),
+            ("http_request_db_queries_count", route, 2),
+            ("cache_requests_total", {"cache": "response", "result": "miss"}, 1),
+            ("cache_requests_total", {"cache": "response", "result": "hit"}, 1),
+        ):
+            self.assertEqual(
+                self.sample(after, name, **labels)
+                - self.sample(before, name, **labels),
+                delta,
+                name,
+            )
+        self.assertGreater(
+            self.sample(after, "http_request_db_queries_sum", **route)
+            - self.sample(before, "http_request_db_queries_sum", **route),
+            0,
+        )
+        self.assertIn("worker_start_time_seconds", after)
+
+    @override_settings(DEBUG=False, ALLOWED_HOSTS=["airbnb.ggorockee.com"])
+    def test_scrape_by_pod_ip(self):
+        with self.assertNumQueries(0):
+            response = self.client.get("/metrics", HTTP_HOST="10.1.2.3:8000")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"worker_start_time_seconds", response.content)
+
+
+class TestHealthChecks(TestCase):
+
+    def setUp(self):
+        readiness.reset()
+        self.addCleanup(readiness.reset)
+
+    def test_live_skips_hosts_auth_and_database(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                "/healthz/live",
+                HTTP_HOST="10.1.2.3:8000",
+                HTTP_AUTHORIZATION="Bearer not-a-token",
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_ready_checks_once_per_period(self):
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(
+                "/healthz/ready",
+                HTTP_HOST="10.1.2.3:8000",
+                HTTP_AUTHORIZATION="Bearer not-a-token",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["checks"],
+            {"database": "ok", "cache": "ok"},
+        )
+        self.assertTrue(
+            any("statement_timeout" in query["sql"] for query in first.captured_queries)
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/healthz/ready/").status_code, 200)
+        # Migrations are only checked until they are found applied.
+        readiness.checked_at = 0
+        with CaptureQueriesContext(connection) as again:
+            self.client.get("/healthz/ready")
+        self.assertLess(len(again.captured_queries), len(first.captured_queries))
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:1/0",
+            }
+        }
+    )
+    def test_ready_fails_without_cache(self):
+        response = self.client.get("/healthz/ready")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "unavailable")
+        self.assertEqual(response.json()["checks"]["database"], "ok")
+        self.assertNotEqual(response.json()["checks"]["cache"], "ok")
+
+
+class TestConnectionBenchmark(TestCase):
+
+    def test_compares_modes(self):
+        out = io.StringIO()
+        call_command("benchmark_connections", requests=3, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            [line.split()[0] for line in lines[1:]],
+            ["reconnect", "persistent", "pool"],
+        )
+
+
+@override_settings(HTTP_RETRY_BACKOFF=0)
+class TestHTTPClient(TestCase):
+    def setUp(self):
+        http_client.reset()
+        self.addCleanup(http_client.reset)
+
+    def test_reuses_connections(self):
+        with StubServer({"GET /a": [(200, {"ok": True})]}) as stub:
+            for _ in range(3):
+                self.assertEqual(http_client.get(f"{stub.url}/a").json(), {"ok": True})
+        self.assertEqual(len({call["port"] for call in stub.calls}), 1)
+
+    def test_retries_idempotent_requests_only(self):
+        routes = {
+            "GET /a": [(503, {}), (200, {"ok": True})],
+            "POST /a": [(503, {}), (200, {"ok": True})],
+        }
+        with StubServer(routes) as stub:
+            self.assertEqual(http_client.get(f"{stub.url}/a").status_code, 200)
+            with self.assertRaises(UpstreamUnavailable):
+                http_client.post(f"{stub.url}/a")
+        self.assertEqual(len(stub.called("GET /a")), 2)
+        self.assertEqual(len(stub.called("POST /a")), 1)
+
+    @override_settings(HTTP_READ_TIMEOUT=0.1, HTTP_RETRIES=0)
+    def test_read_timeout(self):
+        def slow(handler):
+            time.sleep(0.5)
+            return {}
+
+        with StubServer({"GET /slow": [(200, slow)]}) as stub:
+            with self.assertRaises(UpstreamUnavailable):
+                http_client.get(f"{stub.url}/slow")
+            host = stub.url.split("//")[1]
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "http_client_request_duration_seconds_count",
+                {"host": host, "method": "GET", "outcome": "ReadTimeout"},
+            ),
+            1,
+        )
+
+    @override_settings(HTTP_BREAKER_FAILURES=2, HTTP_BREAKER_RESET_SECONDS=60)
+    def test_circuit_breaker(self):
+        with StubServer({"POST /a": [(500, {}), (500, {}), (200, {})]}) as stub:
+            for _ in range(3):
+                with self.assertRaises(UpstreamUnavailable):
+                    http_client.post(f"{stub.url}/a")
+            self.assertEqual(len(stub.calls), 2)
+            with override_settings(HTTP_BREAKER_RESET_SECONDS=0):
+                # One trial call closes the circuit again.
+                self.assertEqual(http_client.post(f"{stub.url}/a").status_code, 200)
+                self.assertEqual(http_client.post(f"{stub.url}/a").status_code, 200)
+        self.assertEqual(len(stub.calls), 4)
+
+    @override_settings(HTTP_BREAKER_FAILURES=1, HTTP_BREAKER_RESET_SECONDS=0)
+    def test_trial_that_raises_releases_the_circuit(self):
+        with StubServer({"POST /a": [(500, {}), (200, {})]}) as stub:
+            with self.assertRaises(UpstreamUnavailable):
+                http_client.post(f"{stub.url}/a")
+            with self.assertRaises(TypeError):
+                http_client.post(f"{stub.url}/a", unknown_argument=True)
+            self.assertEqual(http_client.post(f"{stub.url}/a").status_code, 200)
@@ -0,0 +1,315 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import F, Q
+
+FORMATS = ("csv", "jsonl")
+# CSV has no lists, so many-to-many names are joined with this character.
+LIST_SEPARATOR = "|"
+
+
+def guess_format(path, format=None):
+    if format:
+        return format
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise CommandError("Cannot tell the format from the file name; use --format.")
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def read_rows(stream, format):
+    if format == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+class RowWriter:
+    def __init__(self, stream, format, columns):
+        self.stream = stream
+        self.format = format
+        if format == "csv":
+            self.writer = csv.DictWriter(stream, fieldnames=columns)
+            self.writer.writeheader()
+
+    def write(self, row):
+        if self.format == "csv":
+            self.writer.writerow(
+                {
+                    column: (
+                        LIST_SEPARATOR.join(value) if isinstance(value, list) else value
+                    )
+                    for column, value in row.items()
+                }
+            )
+        else:
+            self.stream.write(json.dumps(row, ensure_ascii=False, default=str))
+            self.stream.write("\n")
+
+
+class LookupMap:
+    """
+    Natural key -> pk map for a related model. Keys are fetched with one
+    query per batch and kept for later batches, up to `max_size` entries, so
+    small tables (categories, amenities) are read once and large ones (users)
+    don't grow without bound. Keys are compared as strings, as CSV has them.
+    """
+
+    def __init__(self, queryset, field, max_size=100_000):
+        # Lowest pk wins when the key isn't unique (e.g. amenity names).
+        self.queryset = queryset.order_by("-pk")
+        self.field = field
+        self.max_size = max_size
+        self.pks = {}
+        opts = queryset.model._meta
+        self.key_field = opts.pk if field == "pk" else opts.get_field(field)
+
+    def load(self, keys):
+        new = set(keys) - self.pks.keys()
+        if not new:
+            return
+        if len(self.pks) + len(new) > self.max_size:
+            # Start over with only this batch's keys, all fetched below.
+            self.pks.clear()
+            new = set(keys)
+        missing = set()
+        for key in new:
+            try:
+                missing.add(self.key_field.to_python(key))
+            except ValidationError:
+                pass
+        if not missing:
+            return
+        rows = self.queryset.filter(**{f"{self.field}__in": missing}).values_list(
+            self.field, "pk"
+        )
+        self.pks.update((str(key), pk) for key, pk in rows)
+
+    def get(self, key):
+        return self.pks.get(key)
+
+
+class Transfer:
+    """
+    How a model maps to flat rows.
+
+    `fields` are plain model fields. `relations` maps a foreign key to a
+    LookupMap factory and the path its natural key is exported from;
+    `many_to_many` does the same for lists of related keys. With `keep_ids`
+    the exported id is imported too, for models that other exports refer
+    to by id; rows without one get a new id.
+    """
+
+    model = None
+    fields = ()
+    relations = {}
+    many_to_many = {}
+    keep_ids = False
+
+    def __init__(self):
+        self.lookups = {
+            name: lookup()
+            for name, (lookup, _) in {**self.relations, **self.many_to_many}.items()
+        }
+
+    @property
+    def columns(self):
+        return ["id", *self.fields, *self.relations, *self.many_to_many]
+
+    # Export
+
+    def export_queryset(self):
+        queryset = self.model.objects.order_by("pk")
+        aliases = {f"_{name}": F(path) for name, (_, path) in self.relations.items()}
+        aliases.update(
+            {
+                f"_{name}": ArrayAgg(
+                    path,
+                    distinct=True,
+                    filter=Q(**{f"{path}__isnull": False}),
+                    default=[],
+                )
+                for name, (_, path) in self.many_to_many.items()
+            }
+        )
+        return queryset.values("id", *self.fields, **aliases)
+
+    def export_rows(self, batch_size):
+        for values in self.export_queryset().iterator(chunk_size=batch_size):
+            yield {
+                column: values.get(column, values.get(f"_{column}"))
+                for column in self.columns
+            }
+
+    # Import
+
+    def parse(self, row, number):
+        data = {}
+        if self.keep_ids and row.get("id") not in ("", None):
+            try:
+                data["id"] = self.model._meta.pk.to_python(row["id"])
+            except ValidationError as error:
+                raise CommandError(f"Row {number}: id: {' '.join(error.messages)}")
+        for name in self.fields:
+            field = self.model._meta.get_field(name)
+            value = row.get(name)
+            if value in ("", None):
+                if field.has_default():
+                    continue
+                if field.null or not field.empty_strings_allowed:
+                    value = None
+                else:
+                    value = ""
+            try:
+                data[name] = field.to_python(value)
+            except ValidationError as error:
+                raise CommandError(f"Row {number}: {name}: {' '.join(error.messages)}")
+        for name in self.relations:
+            value = row.get(name)
+            data[name] = None if value in ("", None) else str(value)
+        for name in self.many_to_many:
+            value = row.get(name) or []
+            if isinstance(value, str):
+                value = value.split(LIST_SEPARATOR)
+            data[name] = [str(key) for key in value]
+        return data
+
+    def resolve(self, data, number):
+        for name in self.relations:
+            key = data.pop(name)
+            pk = None if key is None else self.lookups[name].get(key)
+            if key is not None and pk is None:
+                raise CommandError(f"Row {number}: unknown {name} {key!r}")
+            data[f"{name}_id"] = pk
+        related = {}
+        for name in self.many_to_many:
+            pks = []
+            for key in data.pop(name):
+                pk = self.lookups[name].get(key)
+                if pk is None:
+                    raise CommandError(f"Row {number}: unknown {name} {key!r}")
+                pks.append(pk)
+            related[name] = pks
+        return self.model(**data), related
+
+    def import_batch(self, rows, first_number):
+        parsed = [self.parse(row, first_number + i) for i, row in enumerate(rows)]
+        for name, lookup in self.lookups.items():
+            keys = set()
+            for data in parsed:
+                value = data[name]
+                keys.update(value if isinstance(value, list) else [value])
+            keys.discard(None)
+            lookup.load(keys)
+        instances = []
+        links = []
+        for i, data in enumerate(parsed):
+            instance, related = self.resolve(data, first_number + i)
+            instances.append(instance)
+            links.append(related)
+        self.model.objects.bulk_create(instances)
+        if any("id" in data for data in parsed):
+            # Move the sequence past the kept ids, for the next new rows.
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [self.model]):
+                    cursor.execute(sql)
+        for name in self.many_to_many:
+            field = self.model._meta.get_field(name)
+            through = field.remote_field.through
+            source = field.m2m_field_name()
+            target = field.m2m_reverse_field_name()
+            through.objects.bulk_create(
+                [
+                    through(**{f"{source}_id": instance.pk, f"{target}_id": pk})
+                    for instance, related in zip(instances, links)
+                    for pk in dict.fromkeys(related[name])
+                ]
+            )
+        self.after_import(instances)
+        return len(instances)
+
+    def after_import(self, instances):
+        """Redo what post_save / m2m_changed would have done."""
+
+
+class TransferCommand(BaseCommand):
+
+    transfer_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file, or - for stdin/stdout")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def report(self, verb, count, started, progress=False):
+        if progress and self.verbosity < 2:
+            return
+        elapsed = time.perf_counter() - started
+        label = self.transfer_class.model._meta.verbose_name_plural
+        self.stderr.write(
+            f"{verb} {count} {label} in {elapsed:.1f}s "
+            f"({count / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+
+
+class ImportCommand(TransferCommand):
+    """Stream rows from a file into the table, batch_size rows per insert."""
+
+    def handle(self, *args, path, format, batch_size, **options):
+        self.verbosity = options["verbosity"]
+        format = guess_format(path, format) if path != "-" else format or "jsonl"
+        transfer = self.transfer_class()
+        started = time.perf_counter()
+        count = 0
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            # One transaction: a bad row leaves the table untouched.
+            with transaction.atomic():
+                for batch in batched(read_rows(stream, format), batch_size):
+                    count += transfer.import_batch(batch, count + 1)
+                    self.report("Imported", count, started, progress=True)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.report("Imported", count, started)
+
+
+class ExportCommand(TransferCommand):
+    """Stream the table to a file with a server-side cursor."""
+
+    def handle(self, *args, path, format, batch_size, **options):
+        self.verbosity = options["verbosity"]
+        format = guess_format(path, format) if path != "-" else format or "jsonl"
+        transfer = self.transfer_class()
+        started = time.perf_counter()
+        count = 0
+        stream = (
+            sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        )
+        try:
+            writer = RowWriter(stream, format, transfer.columns)
+            # One snapshot for the whole file.
+            with transaction.atomic():
+                for row in transfer.export_rows(batch_size):
+                    writer.write(row)
+                    count += 1
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        self.report("Exported", count, started)
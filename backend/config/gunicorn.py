@@ -0,0 +1,27 @@
+# Gunicorn settings and hooks (loaded with `gunicorn -c config/gunicorn.py`, see Dockerfile).
+import os
+import shutil
+from pathlib import Path
+
+# Threads let a worker keep serving requests while one waits on the database
+# or on password hashing (both release the GIL), instead of pinning the
+# whole worker for the duration.
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+
+
+def on_starting(server):
+    # Files left by a previous master would be summed into the new metrics.
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        Path(path).mkdir(parents=True, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests, start time);
+    # its counters and histograms stay in the totals.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
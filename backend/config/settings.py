@@ -8,6 +8,43 @@ env = environ.Env(
     # set casting, default value
     DEBUG=(bool, False),
     DJANGO_ALLOWED_HOSTS=(str, ""),
+    PAGE_SIZE=(int, 20),
+    CACHE_VERSION_TIMEOUT=(int, 60),
+    ACCESS_LOG_SLOW_MS=(int, 500),
+    ACCESS_LOG_MAX_QUERIES=(int, 20),
+    ACCESS_LOG_LEVEL=(str, "INFO"),
+    HEALTHCHECK_CACHE_SECONDS=(float, 2.0),
+    HEALTHCHECK_DB_TIMEOUT_MS=(int, 500),
+    DB_CONN_MAX_AGE=(int, 60),
+    DB_CONN_HEALTH_CHECKS=(bool, True),
+    DB_POOL=(bool, False),
+    DB_POOL_MIN_SIZE=(int, 1),
+    DB_POOL_MAX_SIZE=(int, 4),
+    DB_POOL_TIMEOUT=(float, 10.0),
+    DB_CONNECT_TIMEOUT=(int, 5),
+    DB_STATEMENT_TIMEOUT_MS=(int, 30000),
+    AUTH_USER_CACHE_TIMEOUT=(int, 300),
+    AUTH_MODE=(str, "jwt"),
+    UPDATE_LAST_LOGIN=(bool, False),
+    TOKEN_BLACKLIST_SYNC_SECONDS=(float, 5.0),
+    PASSWORD_HASHER=(str, "argon2"),
+    ARGON2_TIME_COST=(int, 2),
+    ARGON2_MEMORY_COST=(int, 19456),
+    ARGON2_PARALLELISM=(int, 1),
+    PASSWORD_HASH_THREADS=(int, 2),
+    PASSWORD_HASH_TIMEOUT=(float, 10.0),
+    SESSION_ENGINE=(str, "django.contrib.sessions.backends.signed_cookies"),
+    HTTP_CONNECT_TIMEOUT=(float, 3.05),
+    HTTP_READ_TIMEOUT=(float, 10.0),
+    HTTP_RETRIES=(int, 2),
+    HTTP_RETRY_BACKOFF=(float, 0.2),
+    HTTP_POOL_MAXSIZE=(int, 10),
+    HTTP_BREAKER_FAILURES=(int, 5),
+    HTTP_BREAKER_RESET_SECONDS=(float, 30.0),
+    GH_CLIENT_ID=(str, "5195598d392601f20eea"),
+    GH_SECRET=(str, ""),
+    CF_ID=(str, ""),
+    CF_TOKEN=(str, ""),
 )
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,11 +77,13 @@ SYSTEM_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PART_APPS = [
     "rest_framework",
     "rest_framework_simplejwt",
+    "rest_framework_simplejwt.token_blacklist",
     "corsheaders",
 ]
 
@@ -64,6 +103,11 @@ CUSTOM_APPS = [
 INSTALLED_APPS = SYSTEM_APPS + THIRD_PART_APPS + CUSTOM_APPS
 
 MIDDLEWARE = [
+    # Probes and /metrics are answered before host checks, authentication
+    # and logging.
+    "common.middleware.HealthCheckMiddleware",
+    # Outermost, so its timing and query count cover the whole stack.
+    "common.middleware.AccessLogMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -123,9 +167,49 @@ DATABASES = {
         "PASSWORD": env("POSTGRES_PASSWORD"),
         "HOST": env("POSTGRES_HOST"),
         "PORT": env("POSTGRES_PORT"),  # 기본 포트 5432
+        # Keep each worker's connection open between requests instead of
+        # reconnecting every time; a broken one is replaced on the next
+        # request thanks to the health check.
+        "CONN_MAX_AGE": env("DB_CONN_MAX_AGE"),
+        "CONN_HEALTH_CHECKS": env("DB_CONN_HEALTH_CHECKS"),
+        "OPTIONS": {
+            "connect_timeout": env("DB_CONNECT_TIMEOUT"),
+            # Server side limit, so a runaway query can't hold a worker (and
+            # its connection) forever. 0 disables it.
+            "options": f"-c statement_timeout={env('DB_STATEMENT_TIMEOUT_MS')}",
+        },
+    }
+}
+
+# DB_POOL=1 uses psycopg's connection pool instead (one pool per worker
+# process). Size it for the threads a worker runs: gunicorn's default sync
+# workers need one connection, threaded workers one per thread. Persistent
+# connections and the pool are mutually exclusive in Django.
+if env("DB_POOL"):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": env("DB_POOL_MIN_SIZE"),
+        "max_size": env("DB_POOL_MAX_SIZE"),
+        "timeout": env("DB_POOL_TIMEOUT"),
     }
+
+
+# Cache
+# Local memory per worker by default. Point CACHE_URL at Redis
+# (e.g. redis://redis:6379/0) to share the cache between workers and pods.
+# A per-worker cache only sees its own writes, so version tokens are
+# re-read after CACHE_VERSION_TIMEOUT seconds. Set it to 0 (never expire)
+# once the cache is shared.
+
+CACHES = {
+    "default": env.cache(
+        "CACHE_URL",
+        default="locmemcache://airbnb?max_entries=10000",
+    ),
 }
 
+CACHE_VERSION_TIMEOUT = env("CACHE_VERSION_TIMEOUT") or None
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -146,6 +230,33 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# New passwords use PASSWORD_HASHER ("argon2" or "pbkdf2"); hashes made by
+# the other one still verify and are upgraded on the next login. The Argon2
+# defaults (19 MiB, 2 passes, 1 lane) follow OWASP's recommendation and take
+# a fraction of PBKDF2's 1M-iteration CPU time.
+
+_PASSWORD_HASHERS = {
+    "argon2": "users.hashers.Argon2PasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = sorted(
+    _PASSWORD_HASHERS.values(),
+    key=lambda hasher: hasher != _PASSWORD_HASHERS[env("PASSWORD_HASHER")],
+)
+ARGON2_TIME_COST = env("ARGON2_TIME_COST")
+ARGON2_MEMORY_COST = env("ARGON2_MEMORY_COST")  # KiB
+ARGON2_PARALLELISM = env("ARGON2_PARALLELISM")
+
+# Logins, sign-ups and password changes hash on a small per-worker thread
+# pool (users.hashers.offload): at most PASSWORD_HASH_THREADS at once, and
+# a 503 after waiting PASSWORD_HASH_TIMEOUT seconds for a turn.
+PASSWORD_HASH_THREADS = env("PASSWORD_HASH_THREADS")
+PASSWORD_HASH_TIMEOUT = env("PASSWORD_HASH_TIMEOUT")
+
+AUTHENTICATION_BACKENDS = ["users.backends.OffloadedModelBackend"]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -174,9 +285,9 @@ REST_FRAMEWORK = {
     # Set the default authentication class for all API views to JWTAuthentication.
     # This means that Django Rest Framework will expect a JWT in the 'Authorization' header
     # for authenticating requests.
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    # users.authentication.CachedJWTAuthentication is simplejwt's
+    # JWTAuthentication with the user row cached (see AUTH_USER_CACHE_TIMEOUT).
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     # Note: Other settings like 'DEFAULT_PERMISSION_CLASSES' can remain as they are.
     # For example:
     # 'DEFAULT_PERMISSION_CLASSES': [
@@ -184,6 +295,37 @@ REST_FRAMEWORK = {
     # ]
 }
 
+# "jwt": email and social logins only return a JWT pair. "session": they
+# also log the user into a Django session, as before.
+AUTH_MODE = env("AUTH_MODE")
+
+# Only the admin still uses sessions; signed cookies keep them out of the
+# database.
+SESSION_ENGINE = env("SESSION_ENGINE")
+
+# How stale a worker's copy of the refresh token blacklist may get
+# (users.tokens.TokenBlacklist).
+TOKEN_BLACKLIST_SYNC_SECONDS = env("TOKEN_BLACKLIST_SYNC_SECONDS")
+
+# Seconds an authenticated user stays cached by CachedJWTAuthentication;
+# 0 loads the user from the database on every request. Only used with a
+# shared CACHE_URL, where changes to a user invalidate it right away; the
+# per-worker default always loads the user.
+AUTH_USER_CACHE_TIMEOUT = env("AUTH_USER_CACHE_TIMEOUT")
+
+# Page size used by common.pagination.KeysetPagination
+PAGE_SIZE = env("PAGE_SIZE")
+
+# Requests slower or chattier than this are logged as warnings by
+# common.middleware.AccessLogMiddleware.
+ACCESS_LOG_SLOW_MS = env("ACCESS_LOG_SLOW_MS")
+ACCESS_LOG_MAX_QUERIES = env("ACCESS_LOG_MAX_QUERIES")
+
+# /healthz/ready re-checks the database, migrations and cache at most once
+# per HEALTHCHECK_CACHE_SECONDS per worker (common.health.Readiness).
+HEALTHCHECK_CACHE_SECONDS = env("HEALTHCHECK_CACHE_SECONDS")
+HEALTHCHECK_DB_TIMEOUT_MS = env("HEALTHCHECK_DB_TIMEOUT_MS")
+
 
 # This assumes you have 'from django.conf import settings' or have SECRET_KEY defined.
 # It's often better to let it use the default.
@@ -199,11 +341,13 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),  # Example: 1 day
     # If True, a new refresh token will be issued when a refresh token is used to obtain a new access token.
     # This enhances security as old refresh tokens become invalid.
-    "ROTATE_REFRESH_TOKENS": False,
+    "ROTATE_REFRESH_TOKENS": True,
     # If True, the old refresh token will be added to a blacklist after it is used (rotated).
     # This prevents the reuse of compromised refresh tokens.
     # Requires 'rest_framework_simplejwt.token_blacklist' in INSTALLED_APPS.
-    "BLACKLIST_AFTER_ROTATION": False,
+    "BLACKLIST_AFTER_ROTATION": True,
+    # Same as simplejwt's, with the blacklist lookup through users.tokens.
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
     # --- Token Signature and Algorithm ---
     # The digital signature algorithm to sign the tokens.
     "ALGORITHM": "HS256",
@@ -222,9 +366,38 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
     # Allows you to add custom claims to the token payload.
     "USER_AUTHENTICATION_RULE": "rest_framework_simplejwt.authentication.default_user_authentication_rule",
+    # Off by default: keeping last_login current costs every JWT login an
+    # UPDATE of the user row (users.views.token_response), on top of the
+    # OutstandingToken insert the blacklist needs.
+    "UPDATE_LAST_LOGIN": env("UPDATE_LAST_LOGIN"),
 }
 
 KAKAO_CLIENT_ID = env("KAKAO_CLIENT_ID")
+GH_CLIENT_ID = env("GH_CLIENT_ID")
+GH_SECRET = env("GH_SECRET")
+# Cloudflare Images (medias.views.GetUploadURL)
+CF_ID = env("CF_ID")
+CF_TOKEN = env("CF_TOKEN")
+
+# Outbound HTTP (common.http_client): every call to GitHub, Kakao and
+# Cloudflare goes through one pooled session with these timeouts (seconds;
+# the read timeout bounds each wait for data, not the whole response).
+# Failed connections, and 502/503/504 answers to GETs, are retried
+# HTTP_RETRIES times with exponential backoff. After HTTP_BREAKER_FAILURES
+# failures in a row a host is skipped for HTTP_BREAKER_RESET_SECONDS.
+HTTP_CONNECT_TIMEOUT = env("HTTP_CONNECT_TIMEOUT")
+HTTP_READ_TIMEOUT = env("HTTP_READ_TIMEOUT")
+HTTP_RETRIES = env("HTTP_RETRIES")
+HTTP_RETRY_BACKOFF = env("HTTP_RETRY_BACKOFF")
+HTTP_POOL_MAXSIZE = env("HTTP_POOL_MAXSIZE")
+HTTP_BREAKER_FAILURES = env("HTTP_BREAKER_FAILURES")
+HTTP_BREAKER_RESET_SECONDS = env("HTTP_BREAKER_RESET_SECONDS")
+# Provider endpoints, overridable so tests can point them at a local server.
+GITHUB_OAUTH_URL = "https://github.com/login/oauth"
+GITHUB_API_URL = "https://api.github.com"
+KAKAO_AUTH_URL = "https://kauth.kakao.com"
+KAKAO_API_URL = "https://kapi.kakao.com"
+CLOUDFLARE_API_URL = "https://api.cloudflare.com/client/v4"
 
 
 APPEND_SLASH = False
@@ -270,6 +443,10 @@ LOGGING = {
             "format": "{levelname} {message}",
             "style": "{",
         },
+        "json": {  # AccessLogMiddleware가 JSON을 직접 만들므로 메시지만 출력
+            "format": "{message}",
+            "style": "{",
+        },
     },
     # 2. 로그를 어디로 보낼지 정의.
     "handlers": {
@@ -278,6 +455,11 @@ LOGGING = {
             "class": "logging.StreamHandler",  # 콘솔 출력을 담당하는 클래스
             "formatter": "verbose",  # 위에서 정의한 'verbose' 포맷 사용
         },
+        "access": {  # 요청당 한 줄의 JSON 액세스 로그
+            "level": "INFO",
+            "class": "logging.StreamHandler",
+            "formatter": "json",
+        },
     },
     # 3. 특정 모듈이나 애플리케이션의 로그를 어떻게 처리할지 정의.
     "loggers": {
@@ -293,6 +475,12 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "access": {  # common.middleware.AccessLogMiddleware
+            "handlers": ["access"],
+            # WARNING이면 임계값을 넘은 요청만 기록
+            "level": env("ACCESS_LOG_LEVEL"),
+            "propagate": False,
+        },
         "airbnb": {  # 사용자 정의 Django 애플리케이션 로거
             "handlers": ["console"],
             "level": "DEBUG" if DEBUG else "INFO",
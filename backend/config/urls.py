@@ -1,5 +1,5 @@
 from django.contrib import admin
-from django.urls import path, include, re_path
+from django.urls import path, include
 
 # Import the token-related views provided by the simplejwt library.
 from rest_framework_simplejwt.views import (
@@ -7,11 +7,8 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
-from . import views
-
 urlpatterns = [
     path("admin/", admin.site.urls),
-    re_path(r"^healthz/ready/?$", views.Healthcheck.as_view()),
     path("api/v1/rooms/", include("rooms.urls")),
     path("api/v1/categories/", include("categories.urls")),
     path("api/v1/experiences/", include("experiences.urls")),
@@ -24,6 +21,7 @@ urlpatterns = [
     # 2. Endpoint to refresh an expired access token.
     #    Clients send a POST request with their 'refresh' token to get a new 'access' token.
     # path("api/v1/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    #    Now served with rotation at api/v1/auth/token/refresh (users/urls.py).
     # path("api/v1/auth/login/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/v1/auth/", include("users.urls")),
 ]
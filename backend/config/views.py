@@ -1,8 +0,0 @@
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
-
-
-class Healthcheck(APIView):
-    def get(self, request):
-        return Response(status=status.HTTP_200_OK)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class ExperiencesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "experiences"
+
+    def ready(self):
+        from common.search import connect_search_vector_signals
+        from .models import Experience
+
+        connect_search_vector_signals(Experience)
@@ -0,0 +1,7 @@
+from common.transfer import ExportCommand
+from experiences.transfer import ExperienceTransfer
+
+
+class Command(ExportCommand):
+    help = "Stream every experience to a CSV or JSONL file, in import_experiences's format."
+    transfer_class = ExperienceTransfer
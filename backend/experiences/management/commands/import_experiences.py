@@ -0,0 +1,9 @@
+from common.transfer import ImportCommand
+from experiences.transfer import ExperienceTransfer
+
+
+class Command(ImportCommand):
+    help = (
+        "Bulk load experiences from a CSV or JSONL file (see experiences/transfer.py)."
+    )
+    transfer_class = ExperienceTransfer
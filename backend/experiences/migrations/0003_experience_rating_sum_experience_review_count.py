@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experience",
+            name="rating_sum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="experience",
+            name="review_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField
+
+
+def populate_search_vector(apps, schema_editor):
+    # The expression from ExperienceQuerySet.update_search_vector(), frozen here
+    # so later model changes don't affect this migration.
+    Experience = apps.get_model("experiences", "Experience")
+    through = Experience._meta.get_field("perks").remote_field.through
+    names = (
+        through.objects.filter(experience=OuterRef("pk"))
+        .order_by()
+        .values("experience")
+        .annotate(names=StringAgg("perk__name", delimiter=" "))
+        .values("names")
+    )
+    Experience.objects.update(
+        search_vector=SearchVector("name", weight="A", config="simple")
+        + SearchVector("city", weight="B", config="simple")
+        + SearchVector("address", weight="B", config="simple")
+        + SearchVector("description", weight="D", config="simple")
+        + SearchVector(
+            Subquery(names, output_field=TextField()), weight="C", config="simple"
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+        ("rooms", "0006_room_search_vector"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="experience",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="experience",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="experience_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="experience",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"],
+                name="experience_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunPython(
+            populate_search_vector,
+            migrations.RunPython.noop,
+        ),
+    ]
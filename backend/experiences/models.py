@@ -1,9 +1,23 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from common.models import CommonModel
+from common.models import CommonModel, RatedModel
+from common.search import SearchableQuerySet
 from django.conf import settings
 
 
-class Experience(CommonModel):
+class ExperienceQuerySet(SearchableQuerySet):
+
+    search_fields = (
+        ("name", "A"),
+        ("city", "B"),
+        ("address", "B"),
+        ("description", "D"),
+    )
+    search_related = (("perks", "name", "C"),)
+
+
+class Experience(CommonModel, RatedModel):
     """Experience Model Definiiton"""
 
     country = models.CharField(
@@ -40,6 +54,22 @@ class Experience(CommonModel):
         on_delete=models.SET_NULL,
         related_name="experiences",
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    objects = ExperienceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"], name="experience_search_vector_idx"),
+            GinIndex(
+                fields=["name"],
+                name="experience_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
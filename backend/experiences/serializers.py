@@ -1,8 +1,32 @@
-from rest_framework.serializers import ModelSerializer
-from .models import Perk
+from rest_framework.serializers import ModelSerializer, SerializerMethodField
+from medias.serializers import PhotoSerializer
+from .models import Experience, Perk
 
 
 class PerkSerializer(ModelSerializer):
     class Meta:
         model = Perk
         fields = "__all__"
+
+
+class ExperienceListSerializer(ModelSerializer):
+
+    rating = SerializerMethodField()
+    photos = PhotoSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Experience
+        fields = (
+            "pk",
+            "name",
+            "country",
+            "city",
+            "price",
+            "start",
+            "end",
+            "rating",
+            "photos",
+        )
+
+    def get_rating(self, experience):
+        return experience.rating()
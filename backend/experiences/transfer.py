@@ -0,0 +1,42 @@
+from functools import partial
+from common.transfer import LookupMap, Transfer
+from categories.models import Category
+from users.models import User
+from .models import Experience, Perk
+
+
+class ExperienceTransfer(Transfer):
+    """Hosts are matched by email, categories and perks by name."""
+
+    model = Experience
+    # Bookings and reviews refer to them by id.
+    keep_ids = True
+    fields = (
+        "name",
+        "country",
+        "city",
+        "price",
+        "address",
+        "start",
+        "end",
+        "description",
+    )
+    relations = {
+        "host": (partial(LookupMap, User.objects.all(), "email"), "host__email"),
+        "category": (
+            partial(
+                LookupMap,
+                Category.objects.filter(kind=Category.CategoryKindChoices.EXPERIENCES),
+                "name",
+            ),
+            "category__name",
+        ),
+    }
+    many_to_many = {
+        "perks": (partial(LookupMap, Perk.objects.all(), "name"), "perks__name"),
+    }
+
+    def after_import(self, experiences):
+        Experience.objects.filter(
+            pk__in=[experience.pk for experience in experiences]
+        ).update_search_vector()
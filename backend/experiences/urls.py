@@ -1,7 +1,8 @@
 from django.urls import path
-from .views import PerkDetail, Perks
+from .views import Experiences, PerkDetail, Perks
 
 urlpatterns = [
+    path("", Experiences.as_view()),
     path("perks/", Perks.as_view()),
     path("perks/<int:pk>", PerkDetail.as_view()),
 ]
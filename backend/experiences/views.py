@@ -2,15 +2,33 @@ from rest_framework.views import APIView
 from rest_framework.status import HTTP_204_NO_CONTENT
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from .models import Perk
-from .serializers import PerkSerializer
+from common.pagination import KeysetPagination
+from common.cache import cache_response
+from .models import Experience, Perk
+from .serializers import ExperienceListSerializer, PerkSerializer
+
+
+class Experiences(APIView):
+    def get(self, request):
+        all_experiences = Experience.objects.prefetch_related("photos")
+        paginator = KeysetPagination()
+        query = request.query_params.get("q")
+        if query:
+            all_experiences = all_experiences.search(query)
+            paginator = KeysetPagination(ordering=("rank", "pk"))
+        experiences = paginator.paginate_queryset(all_experiences, request)
+        serializer = ExperienceListSerializer(experiences, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class Perks(APIView):
+    @cache_response(Perk)
     def get(self, request):
         all_perks = Perk.objects.all()
-        serializer = PerkSerializer(all_perks, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        perks = paginator.paginate_queryset(all_perks, request)
+        serializer = PerkSerializer(perks, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = PerkSerializer(data=request.data)
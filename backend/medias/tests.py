@@ -1,3 +1,23 @@
-from django.test import TestCase
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from common.http_client import client as http_client
+from common.testing import StubServer
 
-# Create your tests here.
+
+class TestGetUploadURL(APITestCase):
+    def setUp(self):
+        http_client.reset()
+        self.addCleanup(http_client.reset)
+
+    def test_one_time_url(self):
+        path = "POST /accounts/cf-id/images/v2/direct_upload"
+        result = {"id": "image-id", "uploadURL": "https://upload.example/1"}
+        with StubServer({path: [(200, {"result": result})]}) as stub:
+            with override_settings(
+                CLOUDFLARE_API_URL=stub.url, CF_ID="cf-id", CF_TOKEN="cf-token"
+            ):
+                response = self.client.post("/api/v1/medias/photos/get-url")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, result)
+        [call] = stub.called(path)
+        self.assertEqual(call["headers"]["Authorization"], "Bearer cf-token")
@@ -1,10 +1,10 @@
-import requests
 from django.conf import settings
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.status import HTTP_200_OK
 from rest_framework.response import Response
 from rest_framework.exceptions import NotFound, PermissionDenied
+from common.http_client import client as http_client
 from .models import Photo
 
 
@@ -30,8 +30,8 @@ class PhotoDetail(APIView):
 
 class GetUploadURL(APIView):
     def post(self, request):
-        url = f"https://api.cloudflare.com/client/v4/accounts/{settings.CF_ID}/images/v2/direct_upload"
-        one_time_url = requests.post(
+        url = f"{settings.CLOUDFLARE_API_URL}/accounts/{settings.CF_ID}/images/v2/direct_upload"
+        one_time_url = http_client.post(
             url,
             headers={
                 "Authorization": f"Bearer {settings.CF_TOKEN}",
@@ -0,0 +1,62 @@
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rooms.models import Room
+from experiences.models import Experience
+from .models import Review
+
+
+def _review_subquery(field, aggregate):
+    reviews = (
+        Review.objects.filter(**{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(value=aggregate)
+        .values("value")
+    )
+    return Coalesce(
+        Subquery(reviews, output_field=IntegerField()),
+        Value(0),
+    )
+
+
+def sync_aggregates_for(queryset, field):
+    """
+    Rewrite review_count / rating_sum on every row of `queryset` whose stored
+    counters drifted from the reviews table. Returns the number of rows fixed.
+    """
+    actual_count = _review_subquery(field, Count("pk"))
+    actual_sum = _review_subquery(field, Sum("rating"))
+    drifted = (
+        queryset.annotate(
+            actual_count=actual_count,
+            actual_sum=actual_sum,
+        )
+        .filter(~Q(review_count=F("actual_count")) | ~Q(rating_sum=F("actual_sum")))
+        .values("pk")
+    )
+    return queryset.model.objects.filter(pk__in=drifted).update(
+        review_count=actual_count,
+        rating_sum=actual_sum,
+        updated_at=timezone.now(),
+    )
+
+
+def sync_review_aggregates(rooms=None, experiences=None):
+    if rooms is None:
+        rooms = Room.objects.all()
+    if experiences is None:
+        experiences = Experience.objects.all()
+    return (
+        sync_aggregates_for(rooms, "room"),
+        sync_aggregates_for(experiences, "experience"),
+    )
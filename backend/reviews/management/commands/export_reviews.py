@@ -0,0 +1,7 @@
+from common.transfer import ExportCommand
+from reviews.transfer import ReviewTransfer
+
+
+class Command(ExportCommand):
+    help = "Stream every review to a CSV or JSONL file, in import_reviews's format."
+    transfer_class = ReviewTransfer
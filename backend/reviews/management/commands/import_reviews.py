@@ -0,0 +1,7 @@
+from common.transfer import ImportCommand
+from reviews.transfer import ReviewTransfer
+
+
+class Command(ImportCommand):
+    help = "Bulk load reviews from a CSV or JSONL file (see reviews/transfer.py)."
+    transfer_class = ReviewTransfer
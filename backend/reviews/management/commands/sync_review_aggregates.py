@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from reviews.aggregates import sync_review_aggregates
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill / repair Room and Experience review_count and rating_sum "
+        "from the reviews table. Only rows that drifted are rewritten."
+    )
+
+    def handle(self, *args, **options):
+        rooms, experiences = sync_review_aggregates()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Repaired {rooms} room(s) and {experiences} experience(s)."
+            )
+        )
@@ -0,0 +1,44 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_aggregates(apps, schema_editor):
+    # The query from reviews.aggregates, frozen here with the historical
+    # models so later app changes don't affect this migration.
+    Review = apps.get_model("reviews", "Review")
+
+    def total(field, aggregate):
+        reviews = (
+            Review.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(value=aggregate)
+            .values("value")
+        )
+        return Coalesce(Subquery(reviews, output_field=IntegerField()), Value(0))
+
+    for app_label, model_name, field in (
+        ("rooms", "Room", "room"),
+        ("experiences", "Experience", "experience"),
+    ):
+        apps.get_model(app_label, model_name).objects.update(
+            review_count=total(field, Count("pk")),
+            rating_sum=total(field, Sum("rating")),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0003_initial"),
+        ("rooms", "0003_room_rating_sum_room_review_count"),
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_review_aggregates,
+            migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+        ("reviews", "0004_backfill_review_aggregates"),
+        ("rooms", "0003_room_rating_sum_room_review_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["room", "created_at", "id"],
+                name="reviews_rev_room_id_4879a8_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="review",
+            index=models.Index(
+                fields=["experience", "created_at", "id"],
+                name="reviews_rev_experie_daa90e_idx",
+            ),
+        ),
+    ]
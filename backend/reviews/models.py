@@ -28,5 +28,23 @@ class Review(CommonModel):
     payload = models.TextField()
     rating = models.PositiveIntegerField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["room", "created_at", "id"]),
+            models.Index(fields=["experience", "created_at", "id"]),
+        ]
+
     def __str__(self) -> str:
         return f"{self.user} / {self.rating}⭐️"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        review = super().from_db(db, field_names, values)
+        # Remember what the row looked like so the aggregate signals can
+        # apply the difference on update / delete.
+        review._loaded_target = review.aggregate_target()
+        return review
+
+    def aggregate_target(self):
+        """Room / experience ids and rating currently counted for this review."""
+        return self.room_id, self.experience_id, self.rating
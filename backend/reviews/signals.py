@@ -0,0 +1,51 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rooms.models import Room
+from experiences.models import Experience
+from .models import Review
+from .aggregates import sync_review_aggregates
+
+
+def apply_review_delta(target, count_delta):
+    """Add (count_delta=1) or remove (count_delta=-1) a review's rating."""
+    room_pk, experience_pk, rating = target
+    if rating is None:
+        return
+    for model, pk in ((Room, room_pk), (Experience, experience_pk)):
+        if pk is None:
+            continue
+        model.objects.filter(pk=pk).update(
+            review_count=F("review_count") + count_delta,
+            rating_sum=F("rating_sum") + count_delta * rating,
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(post_save, sender=Review)
+def add_review_to_aggregates(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    target = instance.aggregate_target()
+    if created:
+        apply_review_delta(target, 1)
+    else:
+        previous = getattr(instance, "_loaded_target", None)
+        if previous is None:
+            # The instance was not loaded from the database, so we cannot
+            # tell what was counted before; rebuild the affected rows.
+            sync_review_aggregates(
+                rooms=Room.objects.filter(pk=instance.room_id),
+                experiences=Experience.objects.filter(pk=instance.experience_id),
+            )
+        elif previous != target:
+            apply_review_delta(previous, -1)
+            apply_review_delta(target, 1)
+    instance._loaded_target = target
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_from_aggregates(sender, instance, **kwargs):
+    target = getattr(instance, "_loaded_target", None)
+    apply_review_delta(target or instance.aggregate_target(), -1)
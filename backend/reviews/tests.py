@@ -1,3 +1,77 @@
 from django.test import TestCase
+from users.models import User
+from rooms.models import Room
+from .models import Review
+from .aggregates import sync_review_aggregates
 
-# Create your tests here.
+
+class TestReviewAggregates(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="guest@test.com", password="x")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.other_room = Room.objects.create(
+            name="Other Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+
+    def create_review(self, rating):
+        return Review.objects.create(
+            user=self.user,
+            room=self.room,
+            payload="",
+            rating=rating,
+        )
+
+    def test_create_update_delete(self):
+        self.create_review(5)
+        review = self.create_review(2)
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.review_count, 2)
+        self.assertEqual(self.room.rating(), 3.5)
+
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 4
+        review.save()
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.rating(), 4.5)
+
+        review.room = self.other_room
+        review.save()
+        self.room.refresh_from_db()
+        self.other_room.refresh_from_db()
+        self.assertEqual(self.room.review_count, 1)
+        self.assertEqual(self.other_room.rating(), 4)
+
+        review.delete()
+        self.other_room.refresh_from_db()
+        self.assertEqual(self.other_room.review_count, 0)
+        self.assertEqual(self.other_room.rating(), 0)
+
+    def test_rating_reads_no_queries(self):
+        self.create_review(3)
+        room = Room.objects.get(pk=self.room.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(room.rating(), 3)
+
+    def test_sync_repairs_drift(self):
+        self.create_review(5)
+        Room.objects.filter(pk=self.room.pk).update(review_count=7, rating_sum=1)
+        self.assertEqual(sync_review_aggregates(), (1, 0))
+        self.room.refresh_from_db()
+        self.assertEqual((self.room.review_count, self.room.rating_sum), (1, 5))
+        self.assertEqual(sync_review_aggregates(), (0, 0))
@@ -0,0 +1,30 @@
+from functools import partial
+from common.transfer import LookupMap, Transfer
+from users.models import User
+from rooms.models import Room
+from experiences.models import Experience
+from .aggregates import sync_review_aggregates
+from .models import Review
+
+
+class ReviewTransfer(Transfer):
+    """Users are matched by email, rooms and experiences by id."""
+
+    model = Review
+    fields = ("payload", "rating")
+    relations = {
+        "user": (partial(LookupMap, User.objects.all(), "email"), "user__email"),
+        "room": (partial(LookupMap, Room.objects.all(), "pk"), "room_id"),
+        "experience": (
+            partial(LookupMap, Experience.objects.all(), "pk"),
+            "experience_id",
+        ),
+    }
+
+    def after_import(self, reviews):
+        sync_review_aggregates(
+            rooms=Room.objects.filter(pk__in={review.room_id for review in reviews}),
+            experiences=Experience.objects.filter(
+                pk__in={review.experience_id for review in reviews}
+            ),
+        )
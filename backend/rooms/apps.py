@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class RoomsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "rooms"
+
+    def ready(self):
+        from common.search import connect_search_vector_signals
+        from .models import Room
+
+        connect_search_vector_signals(Room)
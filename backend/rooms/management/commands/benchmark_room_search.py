@@ -0,0 +1,86 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rooms.models import Room
+from rooms.serializers import RoomSearchSerializer
+from common.benchmark import percentile, rolled_back
+from common.pagination import KeysetPagination
+from common.seed import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed rooms and bookings in a rolled back transaction and measure the "
+        "latency of the room availability search for a few filter mixes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=100_000)
+        parser.add_argument("--bookings-per-room", type=int, default=4)
+        parser.add_argument("--runs", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--explain", action="store_true")
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.seed(options)
+            self.measure(options)
+
+    def seed(self, options):
+        started = time.perf_counter()
+        Seeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        ).run(
+            rooms=options["rooms"],
+            users=max(options["rooms"] // 10, 10),
+            photos=0,
+            reviews=0,
+            bookings=options["bookings_per_room"],
+        )
+        self.stdout.write(
+            f"Seeded {options['rooms']} rooms and "
+            f"{options['rooms'] * options['bookings_per_room']} bookings "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def measure(self, options):
+        check_in = timezone.localtime(timezone.now()).date() + timedelta(days=14)
+        dates = {"check_in": check_in, "check_out": check_in + timedelta(days=3)}
+        scenarios = {
+            "city + dates": {"city": "서울", **dates},
+            "city + price + kind + dates": {
+                "city": "부산",
+                "min_price": 50_000,
+                "max_price": 150_000,
+                "kind": Room.RoomKindChoices.ENTIRE_PLACE,
+                **dates,
+            },
+            "country + pet_friendly + dates": {
+                "country": "한국",
+                "pet_friendly": True,
+                **dates,
+            },
+        }
+        self.stdout.write(f"{'scenario':<32} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, params in scenarios.items():
+            search = RoomSearchSerializer(data=params)
+            search.is_valid(raise_exception=True)
+            # Same first page the endpoint serves.
+            first_page = search.filter_queryset(Room.objects.all()).order_by(
+                "-created_at", "-pk"
+            )[: KeysetPagination().page_size]
+            timings = []
+            for _ in range(options["runs"]):
+                started = time.perf_counter()
+                list(first_page.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(
+                f"{name:<32} {percentile(timings, 50):>8.2f} "
+                f"{percentile(timings, 95):>8.2f}"
+            )
+            if options["explain"]:
+                self.stdout.write(first_page.explain())
@@ -0,0 +1,7 @@
+from common.transfer import ExportCommand
+from rooms.transfer import RoomTransfer
+
+
+class Command(ExportCommand):
+    help = "Stream every room to a CSV or JSONL file, in import_rooms's format."
+    transfer_class = RoomTransfer
@@ -0,0 +1,7 @@
+from common.transfer import ImportCommand
+from rooms.transfer import RoomTransfer
+
+
+class Command(ImportCommand):
+    help = "Bulk load rooms from a CSV or JSONL file (see rooms/transfer.py)."
+    transfer_class = RoomTransfer
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("rooms", "0003_room_rating_sum_room_review_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["created_at", "id"], name="rooms_room_created_2438c1_idx"
+            ),
+        ),
+    ]
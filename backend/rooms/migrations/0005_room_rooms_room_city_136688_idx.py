@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("rooms", "0004_room_rooms_room_created_2438c1_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(
+                fields=["city", "price"], name="rooms_room_city_136688_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:10
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, TextField
+
+
+def populate_search_vector(apps, schema_editor):
+    # The expression from RoomQuerySet.update_search_vector(), frozen here
+    # so later model changes don't affect this migration.
+    Room = apps.get_model("rooms", "Room")
+    through = Room._meta.get_field("amenities").remote_field.through
+    names = (
+        through.objects.filter(room=OuterRef("pk"))
+        .order_by()
+        .values("room")
+        .annotate(names=StringAgg("amenity__name", delimiter=" "))
+        .values("names")
+    )
+    Room.objects.update(
+        search_vector=SearchVector("name", weight="A", config="simple")
+        + SearchVector("city", weight="B", config="simple")
+        + SearchVector("address", weight="B", config="simple")
+        + SearchVector("description", weight="D", config="simple")
+        + SearchVector(
+            Subquery(names, output_field=TextField()), weight="C", config="simple"
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("categories", "0001_initial"),
+        ("rooms", "0005_room_rooms_room_city_136688_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="room",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="room_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="room_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.RunPython(
+            populate_search_vector,
+            migrations.RunPython.noop,
+        ),
+    ]
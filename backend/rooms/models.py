@@ -1,8 +1,38 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from common.models import CommonModel
+from common.models import CommonModel, RatedModel
+from common.search import SearchableQuerySet
 from django.conf import settings
+from bookings.models import Booking
 
-class Room(CommonModel):
+
+class RoomQuerySet(SearchableQuerySet):
+
+    search_fields = (
+        ("name", "A"),
+        ("city", "B"),
+        ("address", "B"),
+        ("description", "D"),
+    )
+    search_related = (("amenities", "name", "C"),)
+
+    def available_between(self, check_in, check_out):
+        """
+        Rooms with no room booking overlapping [check_in, check_out),
+        expressed as NOT EXISTS so the database runs one anti-join.
+        """
+        return self.filter(
+            ~models.Exists(
+                Booking.objects.for_room(models.OuterRef("pk")).overlapping(
+                    check_in,
+                    check_out,
+                )
+            )
+        )
+
+
+class Room(CommonModel, RatedModel):
     """Room Model Definition"""
 
     class RoomKindChoices(models.TextChoices):
@@ -52,6 +82,24 @@ class Room(CommonModel):
         on_delete=models.SET_NULL,
         related_name="rooms",
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+
+    objects = RoomQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["city", "price"]),
+            GinIndex(fields=["search_vector"], name="room_search_vector_idx"),
+            GinIndex(
+                fields=["name"],
+                name="room_name_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
 
     def __str__(room) -> str:
         return room.name
@@ -59,16 +107,6 @@ class Room(CommonModel):
     def total_amenities(room):
         return room.amenities.count()
 
-    def rating(room):
-        count = room.reviews.count()
-        if count == 0:
-            return 0
-        else:
-            total_rating = 0
-            for review in room.reviews.all().values("rating"):
-                total_rating += review["rating"]
-            return round(total_rating / count, 2)
-
 
 class Amenity(CommonModel):
     """Amenity Definiton"""
@@ -7,6 +7,19 @@ from medias.serializers import PhotoSerializer
 from wishlists.models import Wishlist
 
 
+def get_liked_room_ids(context):
+    """
+    Load the requesting user's liked room ids once and keep them in the
+    serializer context, which nested and many=True serializers share.
+    """
+    if "liked_room_ids" not in context:
+        request = context.get("request")
+        context["liked_room_ids"] = Wishlist.objects.liked_room_ids(
+            getattr(request, "user", None)
+        )
+    return context["liked_room_ids"]
+
+
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
         model = Amenity
@@ -34,7 +47,13 @@ class RoomDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Room
-        fields = "__all__"
+        # The search vector and the rating aggregates are internal; the
+        # rating is served by get_rating().
+        exclude = (
+            "search_vector",
+            "review_count",
+            "rating_sum",
+        )
 
     def get_rating(self, room):
         return room.rating()
@@ -42,24 +61,47 @@ class RoomDetailSerializer(serializers.ModelSerializer):
     def get_is_owner(self, room):
         request = self.context.get("request")
         if request:
-            return room.owner == request.user
+            return room.owner_id == request.user.pk
         return False
 
     def get_is_liked(self, room):
-        request = self.context.get("request")
-        if request:
-            if request.user.is_authenticated:
-                return Wishlist.objects.filter(
-                    user=request.user,
-                    rooms__pk=room.pk,
-                ).exists()
-        return False
+        return room.pk in get_liked_room_ids(self.context)
+
+    def update(self, room, validated_data):
+        """
+        Save only the columns whose value changes, and diff the amenities
+        instead of clearing them. `category` and `amenities` are passed in
+        by the view as model instances.
+        """
+        amenities = validated_data.pop("amenities", None)
+        changed = []
+        for field, value in validated_data.items():
+            attname = Room._meta.get_field(field).attname
+            if attname != field:
+                value = value.pk
+            if getattr(room, attname) != value:
+                setattr(room, attname, value)
+                changed.append(field)
+        added = removed = ()
+        if amenities is not None:
+            current = set(room.amenities.values_list("pk", flat=True))
+            added = [amenity for amenity in amenities if amenity.pk not in current]
+            removed = current - {amenity.pk for amenity in amenities}
+        if changed or added or removed:
+            # Amenity changes count as an edit of the room too (updated_at).
+            room.save(update_fields=[*changed, "updated_at"])
+        if removed:
+            room.amenities.remove(*removed)
+        if added:
+            room.amenities.add(*added)
+        return room
 
 
 class RoomListSerializer(serializers.ModelSerializer):
 
     rating = serializers.SerializerMethodField()
     is_owner = serializers.SerializerMethodField()
+    is_liked = serializers.SerializerMethodField()
     photos = PhotoSerializer(many=True, read_only=True)
 
     class Meta:
@@ -72,6 +114,7 @@ class RoomListSerializer(serializers.ModelSerializer):
             "price",
             "rating",
             "is_owner",
+            "is_liked",
             "photos",
         )
 
@@ -79,5 +122,57 @@ class RoomListSerializer(serializers.ModelSerializer):
         return room.rating()
 
     def get_is_owner(self, room):
-        request = self.context["request"]
-        return room.owner == request.user
+        request = self.context.get("request")
+        if request:
+            return room.owner_id == request.user.pk
+        return False
+
+    def get_is_liked(self, room):
+        return room.pk in get_liked_room_ids(self.context)
+
+
+class RoomSearchSerializer(serializers.Serializer):
+    """Validates the query string of the room search endpoint."""
+
+    q = serializers.CharField(required=False)
+    city = serializers.CharField(required=False)
+    country = serializers.CharField(required=False)
+    min_price = serializers.IntegerField(required=False, min_value=0)
+    max_price = serializers.IntegerField(required=False, min_value=0)
+    kind = serializers.ChoiceField(
+        choices=Room.RoomKindChoices.choices,
+        required=False,
+    )
+    pet_friendly = serializers.BooleanField(
+        required=False, allow_null=True, default=None
+    )
+    check_in = serializers.DateField(required=False)
+    check_out = serializers.DateField(required=False)
+
+    def validate(self, data):
+        if ("check_in" in data) != ("check_out" in data):
+            raise serializers.ValidationError(
+                "check_in and check_out must be given together."
+            )
+        if "check_in" in data and data["check_out"] <= data["check_in"]:
+            raise serializers.ValidationError(
+                "Check in should be smaller than check out."
+            )
+        return data
+
+    def filter_queryset(self, rooms):
+        data = self.validated_data
+        for field in ("city", "country", "kind"):
+            if field in data:
+                rooms = rooms.filter(**{field: data[field]})
+        if "min_price" in data:
+            rooms = rooms.filter(price__gte=data["min_price"])
+        if "max_price" in data:
+            rooms = rooms.filter(price__lte=data["max_price"])
+        if data.get("pet_friendly") is not None:
+            rooms = rooms.filter(pet_friendly=data["pet_friendly"])
+        if "check_in" in data:
+            rooms = rooms.available_between(data["check_in"], data["check_out"])
+        if data.get("q"):
+            rooms = rooms.search(data["q"])
+        return rooms
@@ -1,3 +1,369 @@
-from django.test import TestCase
+import re
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from users.models import User
+from medias.models import Photo
+from wishlists.models import Wishlist
+from bookings.models import Booking
+from reviews.models import Review
+from categories.models import Category
+from .models import Amenity, Room
 
-# Create your tests here.
+
+class TestRoomList(APITestCase):
+
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email="host@test.com", password="x")
+
+    def create_rooms(self, count):
+        for i in range(count):
+            room = Room.objects.create(
+                name=f"Room {i}",
+                price=1,
+                rooms=1,
+                toilets=1,
+                description="",
+                address="",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.owner,
+            )
+            Photo.objects.create(
+                file="https://example.com/photo.jpg",
+                description="",
+                room=room,
+            )
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_is_constant(self):
+        self.create_rooms(2)
+        few_rooms = self.count_list_queries()
+        self.create_rooms(20)
+        many_rooms = self.count_list_queries()
+        self.assertEqual(few_rooms, many_rooms)
+        self.assertLessEqual(many_rooms, 2)
+
+    def test_query_count_is_constant_for_owner(self):
+        self.create_rooms(2)
+        self.client.force_authenticate(self.owner)
+        few_rooms = self.count_list_queries()
+        self.create_rooms(20)
+        many_rooms = self.count_list_queries()
+        self.assertEqual(few_rooms, many_rooms)
+        response = self.client.get(self.URL)
+        self.assertTrue(all(room["is_owner"] for room in response.data["results"]))
+
+    def test_is_liked_is_resolved_in_one_query(self):
+        self.create_rooms(3)
+        guest = User.objects.create_user(email="guest@test.com", password="x")
+        wishlist = Wishlist.objects.create(name="Trip", user=guest)
+        wishlist.rooms.add(Room.objects.first())
+        self.client.force_authenticate(guest)
+        few_rooms = self.count_list_queries()
+        self.create_rooms(20)
+        self.assertEqual(few_rooms, self.count_list_queries())
+        liked = Room.objects.latest("created_at")
+        wishlist.rooms.set([liked])
+        response = self.client.get(self.URL)
+        self.assertEqual(
+            [room["pk"] for room in response.data["results"] if room["is_liked"]],
+            [liked.pk],
+        )
+
+
+class TestRoomSearch(APITestCase):
+
+    URL = "/api/v1/rooms/search"
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email="host@test.com")
+        self.rooms = {
+            name: Room.objects.create(
+                name=name,
+                city=city,
+                price=price,
+                rooms=1,
+                toilets=1,
+                description="",
+                address="",
+                pet_friendly=pet_friendly,
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=self.owner,
+            )
+            for name, city, price, pet_friendly in (
+                ("booked", "서울", 100, True),
+                ("free", "서울", 200, False),
+                ("busan", "부산", 100, True),
+            )
+        }
+        self.check_in = timezone.localtime(timezone.now()).date() + timedelta(days=7)
+        Booking.objects.create(
+            kind=Booking.BookingKindChoices.ROOM,
+            user=self.owner,
+            room=self.rooms["booked"],
+            check_in=self.check_in,
+            check_out=self.check_in + timedelta(days=2),
+            guests=1,
+        )
+
+    def search(self, **params):
+        response = self.client.get(self.URL, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(room["name"] for room in response.data["results"])
+
+    def test_filters(self):
+        self.assertEqual(self.search(), ["booked", "busan", "free"])
+        self.assertEqual(self.search(city="서울"), ["booked", "free"])
+        self.assertEqual(self.search(max_price=150), ["booked", "busan"])
+        self.assertEqual(self.search(pet_friendly="false"), ["free"])
+
+    def test_only_available_rooms(self):
+        self.assertEqual(
+            self.search(
+                city="서울",
+                check_in=self.check_in + timedelta(days=1),
+                check_out=self.check_in + timedelta(days=4),
+            ),
+            ["free"],
+        )
+        self.assertEqual(
+            self.search(
+                city="서울",
+                check_in=self.check_in + timedelta(days=2),
+                check_out=self.check_in + timedelta(days=4),
+            ),
+            ["booked", "free"],
+        )
+
+    def test_dates_must_be_given_together(self):
+        response = self.client.get(self.URL, {"check_in": self.check_in})
+        self.assertEqual(response.status_code, 400)
+
+
+class TestRoomFullTextSearch(APITestCase):
+
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        owner = User.objects.create_user(email="host@test.com")
+        self.sauna = Amenity.objects.create(name="Sauna")
+        for name, city, description in (
+            ("강남역 모던 아파트", "서울", "역세권 숙소"),
+            ("Cozy Hanok", "서울", "Traditional house near 강남역"),
+            ("해운대 오션뷰", "부산", "바다 전망"),
+        ):
+            Room.objects.create(
+                name=name,
+                city=city,
+                price=1,
+                rooms=1,
+                toilets=1,
+                description=description,
+                address="",
+                kind=Room.RoomKindChoices.ENTIRE_PLACE,
+                owner=owner,
+            )
+        Room.objects.get(city="부산").amenities.add(self.sauna)
+
+    def search(self, query):
+        response = self.client.get(self.URL, {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [room["name"] for room in response.data["results"]]
+
+    def test_name_matches_rank_first(self):
+        self.assertEqual(self.search("강남역"), ["강남역 모던 아파트", "Cozy Hanok"])
+
+    def test_trigram_fallback(self):
+        # No token equals "강남" or "오션", but the names contain them.
+        self.assertEqual(self.search("강남"), ["강남역 모던 아파트"])
+        self.assertEqual(self.search("오션"), ["해운대 오션뷰"])
+
+    def test_vector_follows_amenities(self):
+        self.assertEqual(self.search("sauna"), ["해운대 오션뷰"])
+        self.sauna.name = "Jacuzzi"
+        self.sauna.save()
+        self.assertEqual(self.search("sauna"), [])
+        self.assertEqual(self.search("jacuzzi"), ["해운대 오션뷰"])
+        self.sauna.delete()
+        self.assertEqual(self.search("jacuzzi"), [])
+
+    def test_amenity_rename_updates_rooms_at_once(self):
+        for room in Room.objects.all():
+            room.amenities.add(self.sauna)
+        self.sauna.name = "Jacuzzi"
+        with CaptureQueriesContext(connection) as context:
+            self.sauna.save()
+        rooms = [q for q in context.captured_queries if '"rooms_room"' in q["sql"]]
+        self.assertEqual(len(rooms), 1)
+        self.assertTrue(rooms[0]["sql"].startswith('UPDATE "rooms_room"'))
+        self.assertEqual(len(self.search("jacuzzi")), 3)
+
+    def test_room_edits_update_the_vector(self):
+        room = Room.objects.get(city="부산")
+        room.description = "Sunset terrace"
+        room.save()
+        self.assertEqual(self.search("terrace"), ["해운대 오션뷰"])
+
+
+class TestRoomDetailConditionalGet(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="host@test.com")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.owner,
+        )
+        self.url = f"/api/v1/rooms/{self.room.pk}"
+        self.etag = self.client.get(self.url)["ETag"]
+
+    def assertModified(self, modified=True):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200 if modified else 304)
+        self.etag = response["ETag"]
+
+    def test_not_modified_without_serializing(self):
+        with self.assertNumQueries(1):
+            self.assertModified(False)
+
+    def test_no_last_modified(self):
+        # A removal leaves no newer timestamp, so If-Modified-Since alone
+        # would get a wrong 304.
+        photo = Photo.objects.create(file="https://example.com/a.jpg", room=self.room)
+        response = self.client.get(self.url)
+        self.assertNotIn("Last-Modified", response)
+        photo.delete()
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["photos"], [])
+
+    def test_related_changes(self):
+        photo = Photo.objects.create(file="https://example.com/a.jpg", room=self.room)
+        self.assertModified()
+        photo.delete()
+        self.assertModified()
+        self.room.amenities.add(Amenity.objects.create(name="Wifi"))
+        self.assertModified()
+        Review.objects.create(user=self.owner, room=self.room, payload="", rating=5)
+        self.assertModified()
+        self.assertModified(False)
+
+    def test_per_user_fields(self):
+        self.client.force_authenticate(self.owner)
+        self.assertModified()
+        Wishlist.objects.create(name="Trip", user=self.owner).rooms.add(self.room)
+        self.assertModified()
+
+    def test_missing_room(self):
+        response = self.client.get("/api/v1/rooms/0", HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
+
+    def test_internal_columns_are_hidden(self):
+        data = self.client.get(self.url).data
+        self.assertIn("rating", data)
+        for column in ("search_vector", "review_count", "rating_sum"):
+            self.assertNotIn(column, data)
+
+
+class TestRoomEditing(APITestCase):
+
+    URL = "/api/v1/rooms/"
+
+    def setUp(self):
+        self.owner = User.objects.create_user(email="host@test.com")
+        self.category = Category.objects.create(
+            name="Hanok",
+            kind=Category.CategoryKindChoices.ROOMS,
+        )
+        self.amenities = [Amenity.objects.create(name=f"Amenity {i}") for i in range(5)]
+        self.client.force_authenticate(self.owner)
+
+    def create_room(self, amenities):
+        return self.client.post(
+            self.URL,
+            {
+                "name": "Room",
+                "price": 1,
+                "rooms": 1,
+                "toilets": 1,
+                "description": "Quiet hanok",
+                "address": "Seoul",
+                "kind": Room.RoomKindChoices.ENTIRE_PLACE,
+                "category": self.category.pk,
+                "amenities": amenities,
+            },
+            format="json",
+        )
+
+    def test_amenities_are_attached_in_bulk(self):
+        pks = [amenity.pk for amenity in self.amenities]
+        with CaptureQueriesContext(connection) as few:
+            self.create_room(pks[:1])
+        with CaptureQueriesContext(connection) as many:
+            response = self.create_room(pks)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(
+            sorted(amenity["pk"] for amenity in response.data["amenities"]),
+            pks,
+        )
+
+    def test_invalid_ids_are_reported(self):
+        response = self.create_room([self.amenities[0].pk, 0, "wifi"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data["amenities"],
+            ["Amenity 0 not found.", "Amenity wifi not found."],
+        )
+        self.assertFalse(Room.objects.exists())
+
+    def update_room(self, pk, data):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.put(f"{self.URL}{pk}", data, format="json")
+        self.assertEqual(response.status_code, 200)
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith(('UPDATE "rooms_room"', "DELETE", "INSERT"))
+        ]
+
+    def test_partial_update_writes_only_changes(self):
+        pks = [amenity.pk for amenity in self.amenities]
+        room = self.create_room(pks[:3]).data
+        self.assertEqual(
+            self.update_room(room["id"], {"price": 1, "amenities": pks[:3]}),
+            [],
+        )
+        (update,) = self.update_room(room["id"], {"price": 2})
+        columns = re.findall(r'"(\w+)" = ', update.split(" WHERE ")[0])
+        self.assertEqual(sorted(columns), ["price", "updated_at"])
+        writes = self.update_room(room["id"], {"amenities": pks[1:4]})
+        self.assertEqual(
+            [sql.split(" ", 1)[0] for sql in writes if not sql.startswith("UPDATE")],
+            ["DELETE", "INSERT"],
+        )
+        self.assertEqual(
+            sorted(Room.objects.get().amenities.values_list("pk", flat=True)),
+            pks[1:4],
+        )
+
+    def test_only_the_owner_can_update(self):
+        room = self.create_room([]).data
+        self.client.force_authenticate(User.objects.create_user(email="x@test.com"))
+        response = self.client.put(f"{self.URL}{room['id']}", {"price": 2})
+        self.assertEqual(response.status_code, 403)
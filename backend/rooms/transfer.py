@@ -0,0 +1,45 @@
+from functools import partial
+from common.transfer import LookupMap, Transfer
+from categories.models import Category
+from users.models import User
+from .models import Amenity, Room
+
+
+class RoomTransfer(Transfer):
+    """Owners are matched by email, categories and amenities by name."""
+
+    model = Room
+    # Bookings and reviews refer to them by id.
+    keep_ids = True
+    fields = (
+        "name",
+        "country",
+        "city",
+        "price",
+        "rooms",
+        "toilets",
+        "description",
+        "address",
+        "pet_friendly",
+        "kind",
+    )
+    relations = {
+        "owner": (partial(LookupMap, User.objects.all(), "email"), "owner__email"),
+        "category": (
+            partial(
+                LookupMap,
+                Category.objects.filter(kind=Category.CategoryKindChoices.ROOMS),
+                "name",
+            ),
+            "category__name",
+        ),
+    }
+    many_to_many = {
+        "amenities": (
+            partial(LookupMap, Amenity.objects.all(), "name"),
+            "amenities__name",
+        ),
+    }
+
+    def after_import(self, rooms):
+        Room.objects.filter(pk__in=[room.pk for room in rooms]).update_search_vector()
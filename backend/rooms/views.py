@@ -1,10 +1,15 @@
-import time
-from django.conf import settings
+from datetime import timedelta
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.views import APIView
-from django.db import transaction
-from rest_framework.status import HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from rest_framework.status import (
+    HTTP_204_NO_CONTENT,
+    HTTP_400_BAD_REQUEST,
+    HTTP_409_CONFLICT,
+)
 from rest_framework.response import Response
 from rest_framework.exceptions import (
     NotFound,
@@ -17,10 +22,58 @@ from . import serializers
 from reviews.serializers import ReviewSerializer
 from medias.serializers import PhotoSerializer
 from bookings.models import Booking
-from bookings.serializers import PublicBookingSerializer, CreateRoomBookingSerializer
+from bookings.serializers import (
+    DATES_TAKEN,
+    PublicBookingSerializer,
+    CreateRoomBookingSerializer,
+)
+from bookings.calendar import get_room_calendar
+from common.pagination import KeysetPagination
+from common.cache import cache_response, conditional_get, related_state
+from medias.models import Photo
+from wishlists.models import Wishlist
+
+
+def get_room_category(pk):
+    if not pk:
+        raise ParseError("Category is required.")
+    try:
+        category = Category.objects.get(pk=pk)
+    except (Category.DoesNotExist, ValueError, TypeError):
+        raise ParseError("Category not found")
+    if category.kind == Category.CategoryKindChoices.EXPERIENCES:
+        raise ParseError("The category kind should be 'rooms'")
+    return category
+
+
+def get_amenities(data):
+    """
+    Resolve the "amenities" ids in `data` with one in_bulk query, keeping
+    their order. Raises ParseError listing every id that isn't an amenity.
+    """
+    if hasattr(data, "getlist"):
+        pks = data.getlist("amenities")
+    else:
+        pks = data.get("amenities") or []
+    if not isinstance(pks, list):
+        raise ParseError("Amenities should be a list of ids.")
+    ids = []
+    for pk in pks:
+        try:
+            ids.append(int(pk))
+        except (TypeError, ValueError):
+            ids.append(None)
+    found = Amenity.objects.in_bulk({pk for pk in ids if pk is not None})
+    invalid = [pk for pk, id in zip(pks, ids) if id not in found]
+    if invalid:
+        raise ParseError(
+            {"amenities": [f"Amenity {pk} not found." for pk in invalid]},
+        )
+    return [found[pk] for pk in dict.fromkeys(ids)]
 
 
 class Amenities(APIView):
+    @cache_response(Amenity)
     def get(self, request):
         all_amenities = Amenity.objects.all()
         serializer = serializers.AmenitySerializer(all_amenities, many=True)
@@ -81,44 +134,38 @@ class Rooms(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request):
-        all_rooms = Room.objects.all()
+        # rating is denormalized on Room and is_owner only needs owner_id,
+        # so photos are the only relation to load: 2 queries for any page.
+        all_rooms = Room.objects.prefetch_related("photos")
+        paginator = KeysetPagination()
+        query = request.query_params.get("q")
+        if query:
+            all_rooms = all_rooms.search(query)
+            paginator = KeysetPagination(ordering=("rank", "pk"))
+        rooms = paginator.paginate_queryset(all_rooms, request)
         serializer = serializers.RoomListSerializer(
-            all_rooms,
+            rooms,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = serializers.RoomDetailSerializer(data=request.data)
         if serializer.is_valid():
-            category_pk = request.data.get("category")
-            if not category_pk:
-                raise ParseError("Category is required.")
-            try:
-                category = Category.objects.get(pk=category_pk)
-                if category.kind == Category.CategoryKindChoices.EXPERIENCES:
-                    raise ParseError("The category kind should be 'rooms'")
-            except Category.DoesNotExist:
-                raise ParseError("Category not found")
-            try:
-                with transaction.atomic():
-                    room = serializer.save(
-                        owner=request.user,
-                        category=category,
-                    )
-                    amenities = request.data.get("amenities")
-                    for amenity_pk in amenities:
-
-                        amenity = Amenity.objects.get(pk=amenity_pk)
-                        room.amenities.add(amenity)
-                    serializer = serializers.RoomDetailSerializer(
-                        room,
-                        context={"request": request},
-                    )
-                    return Response(serializer.data)
-            except Exception as e:
-                raise ParseError("Amenity not found")
+            category = get_room_category(request.data.get("category"))
+            amenities = get_amenities(request.data)
+            with transaction.atomic():
+                room = serializer.save(
+                    owner=request.user,
+                    category=category,
+                )
+                room.amenities.add(*amenities)
+            serializer = serializers.RoomDetailSerializer(
+                room,
+                context={"request": request},
+            )
+            return Response(serializer.data)
         else:
             return Response(
                 serializer.errors,
@@ -126,6 +173,27 @@ class Rooms(APIView):
             )
 
 
+class RoomSearch(APIView):
+    def get(self, request):
+        search = serializers.RoomSearchSerializer(data=request.query_params)
+        if not search.is_valid():
+            return Response(
+                search.errors,
+                status=HTTP_400_BAD_REQUEST,
+            )
+        rooms = search.filter_queryset(Room.objects.prefetch_related("photos"))
+        paginator = KeysetPagination()
+        if search.validated_data.get("q"):
+            paginator = KeysetPagination(ordering=("rank", "pk"))
+        rooms = paginator.paginate_queryset(rooms, request)
+        serializer = serializers.RoomListSerializer(
+            rooms,
+            many=True,
+            context={"request": request},
+        )
+        return paginator.get_paginated_response(serializer.data)
+
+
 class RoomDetail(APIView):
 
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -136,8 +204,62 @@ class RoomDetail(APIView):
         except Room.DoesNotExist:
             raise NotFound
 
+    def get_fingerprint(self, request, pk):
+        photos_at, photo_ids = related_state(Photo.objects.all(), "room")
+        amenities_at, amenity_ids = related_state(
+            Room.amenities.through.objects.all(),
+            "room",
+            timestamp="amenity__updated_at",
+            pk="amenity_id",
+        )
+        state = (
+            Room.objects.filter(pk=pk)
+            .annotate(
+                photos_at=photos_at,
+                photo_ids=photo_ids,
+                amenities_at=amenities_at,
+                amenity_ids=amenity_ids,
+                is_liked=Exists(
+                    Wishlist.rooms.through.objects.filter(
+                        room=OuterRef("pk"),
+                        wishlist__user=request.user.pk,
+                    )
+                ),
+            )
+            .values(
+                "updated_at",
+                "owner_id",
+                "owner__updated_at",
+                "category__updated_at",
+                "photos_at",
+                "photo_ids",
+                "amenities_at",
+                "amenity_ids",
+                "is_liked",
+            )
+            .first()
+        )
+        if state is None:
+            return None
+        state["is_owner"] = state["owner_id"] == request.user.pk
+        return state
+
+    @conditional_get
     def get(self, request, pk):
-        room = self.get_object(pk)
+        try:
+            room = (
+                Room.objects.select_related(
+                    "owner",
+                    "category",
+                )
+                .prefetch_related(
+                    "amenities",
+                    "photos",
+                )
+                .get(pk=pk)
+            )
+        except Room.DoesNotExist:
+            raise NotFound
         serializer = serializers.RoomDetailSerializer(
             room,
             context={"request": request},
@@ -146,9 +268,30 @@ class RoomDetail(APIView):
 
     def put(self, request, pk):
         room = self.get_object(pk)
-        if room.owner != request.user:
+        if room.owner_id != request.user.pk:
             raise PermissionDenied
-        # your magic
+        serializer = serializers.RoomDetailSerializer(
+            room,
+            data=request.data,
+            partial=True,
+        )
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=HTTP_400_BAD_REQUEST,
+            )
+        changes = {}
+        if "category" in request.data:
+            changes["category"] = get_room_category(request.data.get("category"))
+        if "amenities" in request.data:
+            changes["amenities"] = get_amenities(request.data)
+        with transaction.atomic():
+            room = serializer.save(**changes)
+        serializer = serializers.RoomDetailSerializer(
+            room,
+            context={"request": request},
+        )
+        return Response(serializer.data)
 
     def delete(self, request, pk):
         room = self.get_object(pk)
@@ -169,20 +312,17 @@ class RoomReviews(APIView):
             raise NotFound
 
     def get(self, request, pk):
-        try:
-            page = request.query_params.get("page", 1)
-            page = int(page)
-        except ValueError:
-            page = 1
-        page_size = settings.PAGE_SIZE
-        start = (page - 1) * page_size
-        end = start + page_size
         room = self.get_object(pk)
+        paginator = KeysetPagination()
+        reviews = paginator.paginate_queryset(
+            room.reviews.select_related("user"),
+            request,
+        )
         serializer = ReviewSerializer(
-            room.reviews.all()[start:end],
+            reviews,
             many=True,
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request, pk):
         serializer = ReviewSerializer(data=request.data)
@@ -231,30 +371,53 @@ class RoomBookings(APIView):
     def get(self, request, pk):
         room = self.get_object(pk)
         now = timezone.localtime(timezone.now()).date()
-        bookings = Booking.objects.filter(
-            room=room,
-            kind=Booking.BookingKindChoices.ROOM,
+        bookings = Booking.objects.for_room(room).filter(
             check_in__gt=now,
         )
+        paginator = KeysetPagination()
+        bookings = paginator.paginate_queryset(bookings, request)
         serializer = PublicBookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request, pk):
-        room = self.get_object(pk)
-        serializer = CreateRoomBookingSerializer(
-            data=request.data,
-            context={"room": room},
-        )
-        if serializer.is_valid():
-            booking = serializer.save(
-                room=room,
-                user=request.user,
-                kind=Booking.BookingKindChoices.ROOM,
+        try:
+            with transaction.atomic():
+                # Lock just this room's row so the overlap check and the insert
+                # can't interleave with another request for the same room.
+                # Bookings for other rooms are not blocked.
+                try:
+                    room = Room.objects.select_for_update().get(pk=pk)
+                except Room.DoesNotExist:
+                    raise NotFound
+                serializer = CreateRoomBookingSerializer(
+                    data=request.data,
+                    context={"room": room},
+                )
+                if not serializer.is_valid():
+                    taken = any(
+                        error.code == "dates_taken"
+                        for error in serializer.errors.get("non_field_errors", ())
+                    )
+                    return Response(
+                        serializer.errors,
+                        status=HTTP_409_CONFLICT if taken else HTTP_400_BAD_REQUEST,
+                    )
+                booking = serializer.save(
+                    room=room,
+                    user=request.user,
+                    kind=Booking.BookingKindChoices.ROOM,
+                )
+        except IntegrityError as error:
+            # booking_room_no_overlap caught a write that bypassed the lock.
+            diag = getattr(error.__cause__, "diag", None)
+            if getattr(diag, "constraint_name", None) != "booking_room_no_overlap":
+                raise
+            return Response(
+                {"non_field_errors": [DATES_TAKEN]},
+                status=HTTP_409_CONFLICT,
             )
-            serializer = PublicBookingSerializer(booking)
-            return Response(serializer.data)
-        else:
-            return Response(serializer.errors)
+        serializer = PublicBookingSerializer(booking)
+        return Response(serializer.data)
 
 
 class RoomBookingCheck(APIView):
@@ -266,16 +429,45 @@ class RoomBookingCheck(APIView):
 
     def get(self, request, pk):
         room = self.get_object(pk)
-        check_in = request.query_params.get("check_in")
-        check_out = request.query_params.get("check_out")
-        exists = Booking.objects.filter(
-            room=room,
-            check_in__lte=check_out,
-            check_out__gte=check_in,
-        ).exists()
-        if exists:
-            return Response({"ok": False})
-        return Response({"ok": True})
+        try:
+            check_in = parse_date(request.query_params.get("check_in", ""))
+            check_out = parse_date(request.query_params.get("check_out", ""))
+        except ValueError:
+            check_in = check_out = None
+        if not check_in or not check_out or check_out <= check_in:
+            raise ParseError("Invalid check_in / check_out dates.")
+        return Response(
+            {"ok": Booking.objects.is_room_available(room, check_in, check_out)}
+        )
+
+
+class RoomCalendar(APIView):
+
+    MAX_DAYS = 366 * 2
+
+    def get_date(self, request, name, default):
+        """The `name` query parameter as a date, `default` when it's absent."""
+        value = request.query_params.get(name)
+        if not value:
+            return default
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ParseError(f"Invalid {name} date.")
+        return parsed
+
+    def get(self, request, pk):
+        today = timezone.localtime(timezone.now()).date()
+        start = self.get_date(request, "from", today)
+        end = self.get_date(request, "to", start + timedelta(days=90))
+        if end < start or (end - start).days > self.MAX_DAYS:
+            raise ParseError(f"The range must be 0 to {self.MAX_DAYS} days long.")
+        months = get_room_calendar(pk, start, end)
+        if months is None:
+            raise NotFound
+        return Response({"from": start, "to": end, "months": months})
 
 
 def make_error(request):
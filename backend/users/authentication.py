@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from common.cache import bump_version, cache_is_shared, get_version
+
+
+def user_version_name(user_id):
+    return f"user:{user_id}"
+
+
+def invalidate_user(user_id):
+    bump_version(user_version_name(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps the resolved user in the cache for
+    AUTH_USER_CACHE_TIMEOUT seconds, so authenticated requests skip the
+    users query. Entries are keyed by the user id claim and a per-user
+    version that users/signals.py bumps whenever the user is saved or
+    deleted (profile edits, password changes, deactivation).
+
+    Only users that passed JWTAuthentication's checks are cached; the
+    token-dependent revocation check still runs on every request. With a
+    per-worker cache (the locmem default) users aren't cached at all: the
+    other workers would miss the version bump and keep authenticating a
+    deactivated user until their entry expired.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        timeout = settings.AUTH_USER_CACHE_TIMEOUT
+        if not timeout or user_id is None or not cache_is_shared():
+            return super().get_user(validated_token)
+        key = f"auth-user:{user_id}:{get_version(user_version_name(user_id))}"
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, timeout)
+        elif api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
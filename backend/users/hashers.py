@@ -0,0 +1,97 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import APIException
+from rest_framework import status
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Django's Argon2 hasher with costs from settings (ARGON2_*). Existing
+    hashes with other costs are rehashed on the next successful login.
+    """
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many logins at once, please try again."
+    default_code = "password_hashing_busy"
+
+
+_lock = threading.Lock()
+_executor = None
+
+
+def executor():
+    global _executor
+    with _lock:
+        size = settings.PASSWORD_HASH_THREADS
+        if _executor is None or _executor._max_workers != size:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ThreadPoolExecutor(size, thread_name_prefix="password-hash")
+        return _executor
+
+
+def offload(function, *args):
+    """
+    Run a password hash on the worker's hashing threads and wait for it.
+
+    Hashing releases the GIL, so with gunicorn's threaded workers the
+    worker keeps serving other requests meanwhile. At most
+    PASSWORD_HASH_THREADS hashes run at once per worker; a request that
+    can't get its turn within PASSWORD_HASH_TIMEOUT seconds gets a 503
+    instead of piling up more CPU and memory work.
+    """
+    future = executor().submit(function, *args)
+    try:
+        return future.result(timeout=settings.PASSWORD_HASH_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise PasswordHashingBusy
+
+
+def _verify(password, encoded):
+    if not hashers.check_password(password, encoded):
+        return False, False
+    # As in Django's check_password(): a hash from another algorithm, or
+    # with older costs, is rehashed with the preferred hasher.
+    preferred = hashers.get_hasher()
+    hasher = hashers.identify_hasher(encoded)
+    return True, (
+        hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    )
+
+
+def hash_password(password):
+    return offload(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """Return (matches, must_update) for `password` against `encoded`."""
+    return offload(_verify, password, encoded)
+
+
+def check_user_password(user, password):
+    """
+    user.check_password() with the hashing offloaded; upgrades the stored
+    hash to the current hasher and costs when it matches.
+    """
+    matches, must_update = verify_password(password, user.password)
+    if matches and must_update:
+        user.password = hash_password(password)
+        user.save(update_fields=["password"])
+    return matches
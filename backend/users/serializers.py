@@ -2,6 +2,9 @@ from rest_framework.exceptions import ValidationError
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from rest_framework_simplejwt import serializers as jwt_serializers
+from .hashers import check_user_password, hash_password
+from .tokens import RefreshToken
 
 
 class TinyUserSerializer(serializers.ModelSerializer):
@@ -40,8 +43,6 @@ class PrivateUserSerializer(serializers.ModelSerializer):
             "id",
             "is_staff",
             "is_active",
-            "first_name",
-            "last_name",
             "groups",
             "user_permissions",
         )
@@ -51,18 +52,18 @@ class PrivateUserSerializer(serializers.ModelSerializer):
         Overrides the default create method to handle password hashing.
         This is the standard and secure way to create users with DRF.
         """
-        # Remove the plain-text password from the validated data dictionary.
-        password = validated_data.pop("password")
-
-        # Create the user instance with the remaining data.
+        # The password isn't a serializer field (see Meta.exclude), so it is
+        # read from the raw input.
+        password = self.initial_data.get("password")
+        if not password:
+            raise ValidationError({"password": ["This field is required."]})
+
+        # Hash on the hashing threads, then create the user with the hash
+        # in a single INSERT.
         # The '**' operator unpacks the dictionary into keyword arguments.
-        user = get_user_model().objects.create(**validated_data)
-
-        # Use set_password() to hash the password and then save the user.
-        user.set_password(password)
-        user.save()
-
-        return user
+        return get_user_model().objects.create(
+            password=hash_password(password), **validated_data
+        )
 
 
 class PublicUserSerializer(serializers.ModelSerializer):
@@ -104,7 +105,7 @@ class PasswordChangeSerializer(serializers.Serializer):
         """
         # The user is retrieved from the context passed by the view.
         user = self.context["request"].user
-        if not user.check_password(value):
+        if not check_user_password(user, value):
             # Raise a specific, clear error message.
             raise ValidationError("Incorrect old password.")
         return value
@@ -128,6 +129,12 @@ class PasswordChangeSerializer(serializers.Serializer):
         """
         user = self.context["request"].user
         new_password = self.validated_data["new_password"]
-        user.set_password(new_password)
+        user.password = hash_password(new_password)
         user.save()
         return user
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    """Rotates refresh tokens with blacklist checks through users.tokens."""
+
+    token_class = RefreshToken
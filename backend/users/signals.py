@@ -0,0 +1,16 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    # After commit, so a concurrent request can't cache the old row again
+    # under the new version.
+    user_id = getattr(instance, api_settings.USER_ID_FIELD)
+    transaction.on_commit(partial(invalidate_user, user_id))
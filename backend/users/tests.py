@@ -1,3 +1,345 @@
-from django.test import TestCase
+import io
+import tempfile
+import threading
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.cache import cache
+from django.db import connection
+from django.contrib.sessions.models import Session
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from common.http_client import client as http_client
+from common.testing import StubServer
+from . import hashers
+from .models import User
+from .tokens import BloomFilter, token_blacklist
 
-# Create your tests here.
+
+class TestPublicUser(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="host@test.com", username="host")
+        self.url = "/api/v1/auth/@host"
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["username"], "host")
+        etag = response["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.user.email = "new@test.com"
+        self.user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.data["email"], "new@test.com")
+
+
+class TestCachedAuthentication(APITestCase):
+
+    URL = "/api/v1/auth/me"
+
+    def setUp(self):
+        # Users are only cached in a cache all workers share.
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared = self.settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory.name,
+                }
+            }
+        )
+        shared.enable()
+        self.addCleanup(shared.disable)
+        self.user = User.objects.create_user(email="guest@test.com", username="guest")
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def get(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.URL)
+        users = [q for q in context.captured_queries if '"users_user"' in q["sql"]]
+        return response, len(users)
+
+    def test_user_query_skipped_once_cached(self):
+        response, queries = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 1)
+        response, queries = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 0)
+
+    def test_per_worker_cache_is_not_used(self):
+        with self.settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+        ):
+            self.get()
+            response, queries = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, 1)
+
+    def test_profile_edit_invalidates(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put(self.URL, {"username": "renamed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        response, queries = self.get()
+        self.assertEqual(queries, 1)
+        self.assertEqual(response.data["username"], "renamed")
+
+    def test_deactivation_invalidates(self):
+        self.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        response, _ = self.get()
+        self.assertEqual(response.status_code, 401)
+
+
+class TestLogin(APITestCase):
+
+    URL = "/api/v1/auth/login"
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="guest@test.com", password="pw")
+
+    def login(self):
+        response = self.client.post(
+            self.URL, {"email": "guest@test.com", "password": "pw"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_jwt_mode_writes_no_session(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.login()
+        self.assertIn("access_token", response.data)
+        self.assertNotIn("sessionid", response.cookies)
+        self.assertFalse(
+            any("django_session" in query["sql"] for query in context.captured_queries)
+        )
+        self.assertFalse(
+            any(
+                'UPDATE "users_user"' in query["sql"]
+                for query in context.captured_queries
+            )
+        )
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.last_login)
+
+    def test_update_last_login(self):
+        with self.settings(
+            SIMPLE_JWT={**settings.SIMPLE_JWT, "UPDATE_LAST_LOGIN": True}
+        ):
+            self.login()
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+
+    @override_settings(
+        AUTH_MODE="session", SESSION_ENGINE="django.contrib.sessions.backends.db"
+    )
+    def test_session_mode(self):
+        response = self.login()
+        self.assertIn("access_token", response.data)
+        self.assertIn("sessionid", response.cookies)
+        self.assertEqual(Session.objects.count(), 1)
+
+
+class TestPasswordHashing(APITestCase):
+    def test_registration_stores_argon2(self):
+        response = self.client.post(
+            "/api/v1/auth/",
+            {
+                "email": "new@test.com",
+                "username": "new",
+                "password": "s3cret-Pass!",
+                "gender": "male",
+                "language": "kr",
+                "currency": "won",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(email="new@test.com")
+        self.assertTrue(user.password.startswith("argon2$"))
+        self.assertTrue(user.check_password("s3cret-Pass!"))
+
+    def test_login_upgrades_pbkdf2_hash(self):
+        user = User.objects.create_user(email="old@test.com", username="old")
+        pbkdf2 = PBKDF2PasswordHasher()
+        user.password = pbkdf2.encode("pw", pbkdf2.salt())
+        # Current PBKDF2 costs, so only the algorithm change triggers it.
+        self.assertFalse(pbkdf2.must_update(user.password))
+        user.save()
+        response = self.client.post(
+            "/api/v1/auth/login",
+            {"email": "old@test.com", "password": "pw"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("argon2$"))
+
+    @override_settings(PASSWORD_HASH_THREADS=1, PASSWORD_HASH_TIMEOUT=0.05)
+    def test_busy_when_hashing_threads_are_taken(self):
+        User.objects.create_user(email="guest@test.com", password="pw")
+        release = threading.Event()
+        hashers.executor().submit(release.wait)
+        try:
+            response = self.client.post(
+                "/api/v1/auth/login",
+                {"email": "guest@test.com", "password": "pw"},
+                format="json",
+            )
+        finally:
+            release.set()
+        self.assertEqual(response.status_code, 503)
+
+
+class TestTokenRefresh(APITestCase):
+
+    URL = "/api/v1/auth/token/refresh"
+
+    def setUp(self):
+        cache.clear()
+        token_blacklist.reset()
+        self.user = User.objects.create_user(email="guest@test.com", password="pw")
+        response = self.client.post(
+            "/api/v1/auth/login",
+            {"email": "guest@test.com", "password": "pw"},
+            format="json",
+        )
+        self.access = response.data["access_token"]
+        self.refresh = response.data["refresh_token"]
+
+    def refresh_with(self, token):
+        return self.client.post(self.URL, {"refresh": token}, format="json")
+
+    def test_rotation_blacklists_the_used_token(self):
+        response = self.refresh_with(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.data)
+        self.assertNotEqual(response.data["refresh"], self.refresh)
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+        self.assertEqual(self.refresh_with(response.data["refresh"]).status_code, 200)
+
+    def test_logout_blacklists_the_refresh_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        response = self.client.post("/api/v1/auth/logout", {"refresh": self.refresh})
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials()
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+
+    def test_unknown_jti_skips_the_database(self):
+        self.assertNotIn("warm-up", token_blacklist)
+        with self.assertNumQueries(0):
+            self.assertNotIn("not-blacklisted", token_blacklist)
+
+    @override_settings(TOKEN_BLACKLIST_SYNC_SECONDS=0)
+    def test_sees_tokens_blacklisted_elsewhere(self):
+        self.assertNotIn("warm-up", token_blacklist)
+        # As if another worker blacklisted the token.
+        outstanding = OutstandingToken.objects.get()
+        BlacklistedToken.objects.create(token=outstanding)
+        self.assertIn(outstanding.jti, token_blacklist)
+        self.assertEqual(self.refresh_with(self.refresh).status_code, 401)
+
+    @override_settings(TOKEN_BLACKLIST_SYNC_SECONDS=0)
+    def test_sync_reads_rows_past_the_settled_pk(self):
+        outstanding = OutstandingToken.objects.get()
+        settled = BlacklistedToken.objects.create(token=outstanding)
+        BlacklistedToken.objects.filter(pk=settled.pk).update(
+            blacklisted_at=timezone.now() - timedelta(minutes=2)
+        )
+        recent, _ = RefreshToken.for_user(self.user).outstand()
+        BlacklistedToken.objects.create(token=recent)
+        self.assertIn(outstanding.jti, token_blacklist)
+        self.assertEqual(token_blacklist.settled_pk, settled.pk)
+        with CaptureQueriesContext(connection) as context:
+            self.assertIn(recent.jti, token_blacklist)
+        sync = context.captured_queries[0]["sql"]
+        self.assertIn(f'"token_blacklist_blacklistedtoken"."id" > {settled.pk}', sync)
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000)
+        for i in range(1000):
+            bloom.add(f"in-{i}")
+        self.assertTrue(all(f"in-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"out-{i}" in bloom for i in range(10_000))
+        self.assertLess(false_positives, 300)
+
+    def test_prune_tokens(self):
+        past = timezone.now() - timedelta(days=2)
+        for i in range(5):
+            token = OutstandingToken.objects.create(
+                jti=f"expired-{i}", token="", expires_at=past
+            )
+            if i % 2:
+                BlacklistedToken.objects.create(token=token)
+        call_command("prune_tokens", batch_size=2, stdout=io.StringIO())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("user", flat=True)),
+            [self.user.pk],
+        )
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+
+@override_settings(HTTP_RETRY_BACKOFF=0)
+class TestSocialLogin(APITestCase):
+    def setUp(self):
+        http_client.reset()
+        self.addCleanup(http_client.reset)
+
+    def test_kakao(self):
+        profile = {"nickname": "kakao", "profile_image_url": "https://img/k.png"}
+        routes = {
+            "POST /oauth/token": [(200, {"access_token": "kakao-token"})],
+            "GET /v2/user/me": [
+                (200, {"kakao_account": {"email": "k@test.com", "profile": profile}})
+            ],
+        }
+        with StubServer(routes) as stub, self.settings(
+            KAKAO_AUTH_URL=stub.url, KAKAO_API_URL=stub.url
+        ):
+            response = self.client.post("/api/v1/auth/kakao", {"code": "abc"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access_token", response.data)
+        self.assertEqual(User.objects.get(email="k@test.com").username, "kakao")
+        [me] = stub.called("GET /v2/user/me")
+        self.assertEqual(me["headers"]["Authorization"], "Bearer kakao-token")
+        # Both calls share one connection.
+        self.assertEqual(len({call["port"] for call in stub.calls}), 1)
+
+    def test_github(self):
+        routes = {
+            "POST /access_token": [(200, {"access_token": "gh-token"})],
+            "GET /user": [
+                (200, {"login": "octocat", "avatar_url": "https://img/o.png"})
+            ],
+            "GET /user/emails": [(200, [{"email": "gh@test.com"}])],
+        }
+        with StubServer(routes) as stub, self.settings(
+            GITHUB_OAUTH_URL=stub.url, GITHUB_API_URL=stub.url, GH_SECRET="s"
+        ):
+            response = self.client.post("/api/v1/auth/github", {"code": "abc"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.get(email="gh@test.com").username, "octocat")
+        [exchange] = stub.called("POST /access_token")
+        self.assertIn("code=abc", exchange["path"])
+
+    def test_provider_down(self):
+        with StubServer({"POST /oauth/token": [(502, {})]}) as stub, self.settings(
+            KAKAO_AUTH_URL=stub.url
+        ):
+            response = self.client.post("/api/v1/auth/kakao", {"code": "abc"})
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,153 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# Rows blacklisted within this long are read again by every sync, so a
+# blacklisting that committed late isn't skipped.
+SYNC_OVERLAP = timedelta(seconds=60)
+# Expired jtis are dropped by rebuilding the filter this often.
+REBUILD_INTERVAL = 60 * 60
+
+
+class BloomFilter:
+    """Set membership with no false negatives and ~error_rate false positives."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little")
+        b = int.from_bytes(digest[8:], "little")
+        return ((a + i * b) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position // 8] |= 1 << (position % 8)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(
+            self.bits[position // 8] & (1 << (position % 8))
+            for position in self.positions(key)
+        )
+
+
+class TokenBlacklist:
+    """
+    Per-worker view of simplejwt's BlacklistedToken table.
+
+    Every worker keeps a bloom filter of the jtis of unexpired blacklisted
+    tokens and reads new rows at most every TOKEN_BLACKLIST_SYNC_SECONDS.
+    A jti that isn't in the filter is not blacklisted, without a query.
+    Filter hits (blacklisted tokens and rare false positives) are confirmed
+    in the cache and then the database. So a token blacklisted by another
+    worker or pod is refused there after TOKEN_BLACKLIST_SYNC_SECONDS at
+    the latest, whatever cache backend is configured.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+        self.built_at = 0.0
+        self.synced_at = 0.0
+        # Rows up to this pk were blacklisted more than SYNC_OVERLAP ago and
+        # are in the filter; newer ones are read again by every sync.
+        self.settled_pk = 0
+
+    def reset(self):
+        with self.lock:
+            self.filter = None
+
+    def unexpired(self):
+        return BlacklistedToken.objects.filter(
+            token__expires_at__gt=timezone.now()
+        ).values_list("pk", "token__jti", "blacklisted_at")
+
+    def read(self, rows, settled):
+        """
+        Add the jtis of `rows` and move settled_pk past the rows blacklisted
+        before `settled`, taken before the rows were queried.
+        """
+        for pk, jti, blacklisted_at in rows:
+            if jti not in self.filter:
+                self.filter.add(jti)
+            if blacklisted_at <= settled:
+                self.settled_pk = max(self.settled_pk, pk)
+        self.synced_at = time.monotonic()
+
+    def rebuild(self):
+        settled = timezone.now() - SYNC_OVERLAP
+        rows = list(self.unexpired())
+        self.filter = BloomFilter(max(1024, 2 * len(rows)))
+        self.settled_pk = 0
+        self.read(rows, settled)
+        self.built_at = self.synced_at
+
+    def sync(self):
+        # A range scan of the primary key; blacklisted_at has no index. Ids
+        # are taken at insert, so a row that commits late still has a pk
+        # above those blacklisted before it.
+        settled = timezone.now() - SYNC_OVERLAP
+        self.read(self.unexpired().filter(pk__gt=self.settled_pk), settled)
+
+    def refresh(self):
+        with self.lock:
+            now = time.monotonic()
+            if (
+                self.filter is None
+                or self.filter.count > self.filter.capacity
+                or now - self.built_at > REBUILD_INTERVAL
+            ):
+                self.rebuild()
+            elif now - self.synced_at > settings.TOKEN_BLACKLIST_SYNC_SECONDS:
+                self.sync()
+
+    def __contains__(self, jti):
+        self.refresh()
+        if jti not in self.filter:
+            return False
+        key = f"token-blacklisted:{jti}"
+        if cache.get(key):
+            return True
+        if BlacklistedToken.objects.filter(token__jti=jti).exists():
+            # Blacklisting is permanent, so positives can be cached for as
+            # long as the token could still be presented.
+            cache.set(key, True, api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+            return True
+        return False
+
+    def add(self, jti):
+        with self.lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+
+
+token_blacklist = TokenBlacklist()
+
+
+class RefreshToken(tokens.RefreshToken):
+    """simplejwt's RefreshToken with blacklist lookups through TokenBlacklist."""
+
+    def check_blacklist(self):
+        if self.payload[api_settings.JTI_CLAIM] in token_blacklist:
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        token_blacklist.add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -1,12 +1,17 @@
 from django.urls import re_path
+from rest_framework_simplejwt.views import TokenRefreshView
 from . import views
 
 urlpatterns = [
     re_path(r"/?$", views.Users.as_view()),
     re_path(r"^login/?$", views.LoginView.as_view()),
+    # Exchanges a refresh token for a new access/refresh pair; the old
+    # refresh token is blacklisted (SIMPLE_JWT rotation settings).
+    re_path(r"^token/refresh/?$", TokenRefreshView.as_view()),
     re_path(r"^logout/?$", views.LogoutView.as_view()),
     re_path(r"^me/?$", views.Me.as_view()),
-    re_path(r"^@<str:username>/?$", views.PublicUser.as_view()),
+    re_path(r"^@(?P<username>[^/]+)/?$", views.PublicUser.as_view()),
     re_path(r"^change-password/?$", views.ChangePassword.as_view()),
+    re_path(r"^github/?$", views.GithubLogIn.as_view()),
     re_path(r"^kakao/?$", views.KakaoLogIn.as_view()),
 ]
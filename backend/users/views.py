@@ -2,8 +2,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import authenticate, get_user_model, logout, login
+from django.contrib.auth.models import update_last_login
 from django.shortcuts import get_object_or_404
-import requests
 from django.conf import settings
 
 from rest_framework.exceptions import (
@@ -12,14 +12,43 @@ from rest_framework.exceptions import (
 
 from rest_framework.permissions import IsAuthenticated
 from . import serializers
+from common.cache import conditional_get
+from common.http_client import UpstreamUnavailable, client as http_client
 
-# Import the RefreshToken model from simple-jwt
-from rest_framework_simplejwt.tokens import RefreshToken
+# simple-jwt helpers; RefreshToken checks the blacklist through users/tokens.py.
+# Its settings are read through the module, which rebinds api_settings
+# when SIMPLE_JWT changes.
+from rest_framework_simplejwt import settings as jwt
+from rest_framework_simplejwt.exceptions import TokenError
+from .tokens import RefreshToken
 
 # It's good practice to use a serializer for user data
 from .serializers import TinyUserSerializer, PasswordChangeSerializer
 
 
+def token_response(request, user):
+    """
+    The login response shared by email and social logins: a JWT pair and
+    the user. Only AUTH_MODE = "session" also logs the user into a Django
+    session; API views authenticate with the JWT alone, so in the default
+    "jwt" mode no session is written.
+    """
+    refresh = RefreshToken.for_user(user)
+    if settings.AUTH_MODE == "session":
+        login(request, user)
+    elif jwt.api_settings.UPDATE_LAST_LOGIN:
+        update_last_login(None, user)
+    return Response(
+        {
+            "message": "Login successful",
+            "user": TinyUserSerializer(user).data,
+            "access_token": str(refresh.access_token),
+            "refresh_token": str(refresh),
+        },
+        status=status.HTTP_200_OK,
+    )
+
+
 class LoginView(APIView):
     """
     API View for user login.
@@ -43,22 +72,7 @@ class LoginView(APIView):
         user = authenticate(username=email, password=password)
         # check if autheication was successful
         if user is not None:
-            # If the user is authenticated, generate JWT tokens
-            refresh = RefreshToken.for_user(user)
-            access_token = str(refresh.access_token)
-
-            # serialize the user data
-            user_serializer = TinyUserSerializer(user)
-
-            # Prepare the response data
-            response_data = {
-                "message": "Login successful",
-                "user": user_serializer.data,
-                "access_token": access_token,
-                "refresh_token": str(refresh),
-            }
-            login(request, user)
-            return Response(response_data, status=status.HTTP_200_OK)
+            return token_response(request, user)
 
         raise AuthenticationFailed("Invalid credentials, please try again.")
 
@@ -113,8 +127,27 @@ class LogoutView(APIView):
         vulnerabilities that could arise if a GET request were used.
         """
         # The `logout` function from django.contrib.auth handles the process
-        # of clearing the user's session data from the server.
-        logout(request)
+        # of clearing the user's session data from the server. JWT clients
+        # drop their tokens; a refresh token sent along is blacklisted so it
+        # can't be used again.
+        if settings.AUTH_MODE == "session":
+            logout(request)
+        refresh = request.data.get("refresh")
+        if refresh:
+            try:
+                token = RefreshToken(refresh)
+            except TokenError as error:
+                return Response(
+                    {"refresh": [str(error)]}, status=status.HTTP_400_BAD_REQUEST
+                )
+            if token.get(jwt.api_settings.USER_ID_CLAIM) != getattr(
+                request.user, jwt.api_settings.USER_ID_FIELD
+            ):
+                return Response(
+                    {"refresh": ["Token belongs to another user."]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            token.blacklist()
 
         # Return a success response. It's good practice to provide a clear
         # message. The status code 200 OK is appropriate.
@@ -129,6 +162,17 @@ class PublicUser(APIView):
     API View to display a user's public profile information.
     """
 
+    def get_fingerprint(self, request, username):
+        users = list(
+            get_user_model()
+            .objects.filter(username=username)
+            .values("pk", "updated_at")[:2]
+        )
+        if len(users) != 1:
+            return None
+        return users[0]
+
+    @conditional_get
     def get(self, request, username):
         """
         Handles GET requests to retrieve a user's public profile
@@ -231,42 +275,40 @@ class GithubLogIn(APIView):
     def post(self, request):
         try:
             code = request.data.get("code")
-            access_token = requests.post(
-                f"https://github.com/login/oauth/access_token?code={code}&client_id=5195598d392601f20eea&client_secret={settings.GH_SECRET}",
+            access_token = http_client.post(
+                f"{settings.GITHUB_OAUTH_URL}/access_token",
+                params={
+                    "code": code,
+                    "client_id": settings.GH_CLIENT_ID,
+                    "client_secret": settings.GH_SECRET,
+                },
                 headers={"Accept": "application/json"},
             )
             access_token = access_token.json().get("access_token")
-            user_data = requests.get(
-                "https://api.github.com/user",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            user_data = user_data.json()
-            user_emails = requests.get(
-                "https://api.github.com/user/emails",
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Accept": "application/json",
-                },
-            )
-            user_emails = user_emails.json()
+            headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Accept": "application/json",
+            }
+            user_data = http_client.get(
+                f"{settings.GITHUB_API_URL}/user", headers=headers
+            ).json()
+            user_emails = http_client.get(
+                f"{settings.GITHUB_API_URL}/user/emails", headers=headers
+            ).json()
             try:
                 user = get_user_model().objects.get(email=user_emails[0]["email"])
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
+                return token_response(request, user)
             except get_user_model().DoesNotExist:
                 user = get_user_model().objects.create(
                     username=user_data.get("login"),
                     email=user_emails[0]["email"],
-                    name=user_data.get("name"),
                     avatar=user_data.get("avatar_url"),
                 )
                 user.set_unusable_password()
                 user.save()
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
+                return token_response(request, user)
+        except UpstreamUnavailable:
+            raise
         except Exception:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
@@ -282,8 +324,8 @@ class KakaoLogIn(APIView):
     def post(self, request):
         try:
             code = request.data.get("code")
-            access_token = requests.post(
-                "https://kauth.kakao.com/oauth/token",
+            access_token = http_client.post(
+                f"{settings.KAKAO_AUTH_URL}/oauth/token",
                 headers={"Content-Type": "application/x-www-form-urlencoded"},
                 data={
                     "grant_type": "authorization_code",
@@ -294,8 +336,8 @@ class KakaoLogIn(APIView):
             )
 
             access_token = access_token.json().get("access_token")
-            user_data = requests.get(
-                "https://kapi.kakao.com/v2/user/me",
+            user_data = http_client.get(
+                f"{settings.KAKAO_API_URL}/v2/user/me",
                 headers={
                     "Authorization": f"Bearer {access_token}",
                     "Content-type": "application/x-www-form-urlencoded;charset=utf-8",
@@ -308,8 +350,7 @@ class KakaoLogIn(APIView):
 
             try:
                 user = get_user_model().objects.get(email=kakao_account.get("email"))
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
+                return token_response(request, user)
             except get_user_model().DoesNotExist:
                 user = get_user_model().objects.create(
                     email=kakao_account.get("email"),
@@ -318,8 +359,9 @@ class KakaoLogIn(APIView):
                 )
                 user.set_unusable_password()
                 user.save()
-                login(request, user)
-                return Response(status=status.HTTP_200_OK)
+                return token_response(request, user)
+        except UpstreamUnavailable:
+            raise
         except Exception as e:
             return Response(
                 {"error": str(e)},  # 에러 메시지를 프론트에도 전달
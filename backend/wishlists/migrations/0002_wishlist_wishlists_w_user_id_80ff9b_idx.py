@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("experiences", "0003_experience_rating_sum_experience_review_count"),
+        ("rooms", "0004_room_rooms_room_created_2438c1_idx"),
+        ("wishlists", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="wishlist",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="wishlists_w_user_id_80ff9b_idx",
+            ),
+        ),
+    ]
@@ -3,6 +3,18 @@ from common.models import CommonModel
 from django.conf import settings
 
 
+class WishlistManager(models.Manager):
+    def liked_room_ids(self, user):
+        """Ids of every room saved in any of the user's wishlists (1 query)."""
+        if user is None or not user.is_authenticated:
+            return frozenset()
+        return frozenset(
+            self.model.rooms.through.objects.filter(
+                wishlist__user=user,
+            ).values_list("room_id", flat=True)
+        )
+
+
 class Wishlist(CommonModel):
     """Wishlist Model Definition"""
 
@@ -23,5 +35,12 @@ class Wishlist(CommonModel):
         related_name="wishlists",
     )
 
+    objects = WishlistManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at", "id"]),
+        ]
+
     def __str__(self) -> str:
         return self.name
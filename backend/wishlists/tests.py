@@ -1,3 +1,41 @@
-from django.test import TestCase
+from rest_framework.test import APITestCase
+from users.models import User
+from rooms.models import Room
+from medias.models import Photo
+from .models import Wishlist
 
-# Create your tests here.
+
+class TestWishlistConditionalGet(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="guest@test.com")
+        self.room = Room.objects.create(
+            name="Room",
+            price=1,
+            rooms=1,
+            toilets=1,
+            description="",
+            address="",
+            kind=Room.RoomKindChoices.ENTIRE_PLACE,
+            owner=self.user,
+        )
+        self.wishlist = Wishlist.objects.create(name="Trip", user=self.user)
+        self.url = f"/api/v1/wishlists/{self.wishlist.pk}"
+        self.client.force_authenticate(self.user)
+
+    def test_etag_follows_rooms_and_photos(self):
+        etag = self.client.get(self.url)["ETag"]
+        self.client.put(f"{self.url}/rooms/{self.room.pk}")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(len(response.data["rooms"]), 1)
+        etag = response["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        Photo.objects.create(file="https://example.com/a.jpg", room=self.room)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["rooms"][0]["photos"]), 1)
+
+    def test_other_users_wishlist(self):
+        self.client.force_authenticate(User.objects.create_user(email="x@test.com"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(response.status_code, 404)
@@ -4,6 +4,9 @@ from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rooms.models import Room
+from common.pagination import KeysetPagination
+from common.cache import conditional_get, related_state
+from medias.models import Photo
 from .models import Wishlist
 from .serializers import WishlistSerializer
 
@@ -13,13 +16,17 @@ class Wishlists(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        all_wishlists = Wishlist.objects.filter(user=request.user)
+        all_wishlists = Wishlist.objects.filter(
+            user=request.user,
+        ).prefetch_related("rooms__photos")
+        paginator = KeysetPagination()
+        wishlists = paginator.paginate_queryset(all_wishlists, request)
         serializer = WishlistSerializer(
-            all_wishlists,
+            wishlists,
             many=True,
             context={"request": request},
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = WishlistSerializer(data=request.data)
@@ -37,14 +44,42 @@ class WishlistDetail(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def get_object(self, pk, user):
+    def get_object(self, pk, user, queryset=Wishlist.objects.all()):
         try:
-            return Wishlist.objects.get(pk=pk, user=user)
+            return queryset.get(pk=pk, user=user)
         except Wishlist.DoesNotExist:
             raise NotFound
 
+    def get_fingerprint(self, request, pk):
+        rooms_at, room_ids = related_state(
+            Wishlist.rooms.through.objects.all(),
+            "wishlist",
+            timestamp="room__updated_at",
+            pk="room_id",
+        )
+        photos_at, photo_ids = related_state(Photo.objects.all(), "room__wishlists")
+        state = (
+            Wishlist.objects.filter(pk=pk, user=request.user)
+            .annotate(
+                rooms_at=rooms_at,
+                room_ids=room_ids,
+                photos_at=photos_at,
+                photo_ids=photo_ids,
+            )
+            .values("updated_at", "rooms_at", "room_ids", "photos_at", "photo_ids")
+            .first()
+        )
+        if state is None:
+            return None
+        return state
+
+    @conditional_get
     def get(self, request, pk):
-        wishlist = self.get_object(pk, request.user)
+        wishlist = self.get_object(
+            pk,
+            request.user,
+            Wishlist.objects.prefetch_related("rooms__photos"),
+        )
         serializer = WishlistSerializer(
             wishlist,
             context={"request": request},